@@ -0,0 +1,54 @@
+"""
+Замер скорости разбора строк логов.
+
+Разбирает одни и те же строки несколько раз и печатает лучшую скорость в строках в секунду.
+
+Пример запуска:
+python -m benchmarks.parser_benchmark --lines 100000 --runs 5
+"""
+import sys
+import time
+from argparse import ArgumentParser
+
+from src.log_workers.log_parser import LogParser
+
+LOG_LINES = [
+    '93.180.71.3 - - [17/May/2015:08:05:32 +0000] "GET /downloads/product_1 HTTP/1.1" 304 0 '
+    '"-" "Debian APT-HTTP/1.3 (0.8.16~exp12ubuntu10.21)"\n',
+    '217.168.17.5 - - [17/May/2015:08:05:34 +0000] "GET /downloads/product_1 HTTP/1.1" 200 490 '
+    '"https://example.com/?q=\\"logs\\"" "Debian APT-HTTP/1.3 (0.8.10.3)"\n',
+    '80.91.33.133 - - [17/May/2015:08:05:24 +0000] "GET /downloads/product_2 HTTP/1.1" 404 337 '
+    '"-" "Debian APT-HTTP/1.3 (0.8.16~exp12ubuntu10.17)"\n',
+    'garbage line that does not match the format\n',
+]
+
+
+def measure(lines: list[str], runs: int) -> float:
+    """
+    Разбирает строки несколько раз.
+
+    :param lines: Строки логов.
+    :param runs: Число повторов.
+    :return: Лучшее время разбора всех строк в секундах.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        LogParser.parse_lines(lines)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(params):
+    parser = ArgumentParser(description="Log line parser benchmark")
+    parser.add_argument("--lines", type=int, default=100000, help="Number of lines to parse per run")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs")
+    args = parser.parse_args(params)
+
+    lines = [LOG_LINES[index % len(LOG_LINES)] for index in range(args.lines)]
+    seconds = measure(lines, args.runs)
+    print(f"{args.lines / seconds:12.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""
+Замер времени холодного старта анализатора.
+
+Запускает интерпретатор несколько раз для импорта точки входа и для отчёта по маленькому логу
+и печатает медиану и минимум времени запуска в миллисекундах.
+
+Пример запуска:
+python -m benchmarks.startup_benchmark --runs 20
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+LOG_LINE = (
+    '93.180.71.3 - - [17/May/2015:08:05:32 +0000] "GET /downloads/product_1 HTTP/1.1" 304 0 '
+    '"-" "Debian APT-HTTP/1.3 (0.8.16~exp12ubuntu10.21)"\n'
+)
+
+
+def measure(command: list[str], runs: int) -> list[float]:
+    """
+    Запускает команду заданное число раз и возвращает время каждого запуска.
+
+    :param command: Команда для запуска.
+    :param runs: Число запусков.
+    :return: Список времён запуска в миллисекундах.
+    """
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main(params):
+    parser = ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Number of interpreter launches per scenario")
+    args = parser.parse_args(params)
+
+    descriptor, log_path = tempfile.mkstemp(suffix=".log")
+    with os.fdopen(descriptor, "w") as file:
+        file.writelines([LOG_LINE] * 100)
+
+    scenarios = {
+        "interpreter": [sys.executable, "-c", "pass"],
+        "import src.main": [sys.executable, "-c", "import src.main"],
+        "report (100 lines)": [sys.executable, "-m", "src.main", "--sources", log_path],
+    }
+    try:
+        for name, command in scenarios.items():
+            timings = measure(command, args.runs)
+            print(f"{name:<20} median {statistics.median(timings):7.1f} ms   min {min(timings):7.1f} ms")
+    finally:
+        os.remove(log_path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,319 @@
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+from src.log_workers.resource_normalizer import ResourceNormalizer
+
+
+class Anomaly:
+    """
+    Найденная аномалия: какой детектор сработал, на каком ключе, когда и с каким значением.
+    """
+
+    __slots__ = ("detector", "key", "timestamp", "value", "threshold")
+
+    def __init__(self, detector: str, key: str, timestamp: int, value: float, threshold: float):
+        """
+        :param detector: Название детектора.
+        :param key: Ключ аномалии (IP-адрес, ресурс или класс статусов).
+        :param timestamp: Время окончания окна, в котором найдена аномалия (Unix time).
+        :param value: Наблюдаемое значение.
+        :param threshold: Порог, который значение превысило.
+        """
+        self.detector = detector
+        self.key = key
+        self.timestamp = timestamp
+        self.value = value
+        self.threshold = threshold
+
+    @property
+    def time(self) -> str:
+        """
+        Возвращает время аномалии в формате ISO8601 (UTC).
+
+        :return: Строка со временем.
+        """
+        return datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat()
+
+    def __repr__(self) -> str:
+        return f"Anomaly({self.detector!r}, {self.key!r}, {self.time}, {self.value}, {self.threshold})"
+
+
+class SlidingWindowCounter:
+    """
+    Счётчик событий в скользящем окне на кольцевом буфере.
+
+    Окно разбито на корзины фиксированной длины; при сдвиге времени устаревшие корзины обнуляются,
+    поэтому добавление события стоит O(число корзин) в худшем случае и O(1) амортизированно.
+    События старше окна игнорируются.
+    """
+
+    __slots__ = ("bucket_seconds", "_buckets", "_last_bucket", "total", "alerted_until")
+
+    def __init__(self, window_seconds: int, buckets: int):
+        """
+        :param window_seconds: Длина окна в секундах.
+        :param buckets: Число корзин в окне.
+        """
+        self.bucket_seconds = max(window_seconds // buckets, 1)
+        self._buckets = [0] * buckets
+        self._last_bucket = None
+        self.total = 0
+        self.alerted_until = 0
+
+    def add(self, timestamp: int) -> int:
+        """
+        Добавляет событие и возвращает число событий в окне, заканчивающемся в timestamp.
+
+        :param timestamp: Время события (Unix time).
+        :return: Число событий в окне.
+        """
+        bucket = timestamp // self.bucket_seconds
+        size = len(self._buckets)
+
+        if self._last_bucket is None:
+            self._last_bucket = bucket
+        elif bucket > self._last_bucket:
+            for expired in range(self._last_bucket + 1, min(bucket, self._last_bucket + size) + 1):
+                self.total -= self._buckets[expired % size]
+                self._buckets[expired % size] = 0
+            self._last_bucket = bucket
+        elif bucket <= self._last_bucket - size:
+            return self.total
+
+        self._buckets[bucket % size] += 1
+        self.total += 1
+        return self.total
+
+
+class AnomalyDetector(ABC):
+    """
+    Абстрактный потоковый детектор аномалий. Получает записи логов по одной в порядке времени
+    и накапливает найденные аномалии в списке anomalies. Состояние детектора ограничено по размеру.
+    """
+
+    name = ""
+
+    def __init__(self):
+        self.anomalies = []
+
+    @abstractmethod
+    def observe(self, log: Mapping, timestamp: int) -> None:
+        """
+        Учитывает одну запись лога.
+
+        :param log: Строка лога.
+        :param timestamp: Время записи (Unix time).
+        """
+        pass
+
+    def finish(self) -> None:
+        """
+        Завершает поток: детекторы с окнами проверяют последнее незакрытое окно.
+        """
+        pass
+
+
+class IpRateDetector(AnomalyDetector):
+    """
+    Находит IP-адреса, сделавшие больше max_requests запросов за скользящее окно.
+
+    Для каждого адреса хранится счётчик на кольцевом буфере. Число адресов ограничено max_keys:
+    при переполнении вытесняется адрес, дольше всех не делавший запросов. По каждому адресу
+    сообщается не чаще одного раза за окно.
+    """
+
+    name = "IP request rate"
+
+    def __init__(self, max_requests: int = 600, window_seconds: int = 60, buckets: int = 12, max_keys: int = 10000):
+        """
+        :param max_requests: Допустимое число запросов с одного адреса за окно.
+        :param window_seconds: Длина окна в секундах.
+        :param buckets: Число корзин в окне.
+        :param max_keys: Максимальное число одновременно отслеживаемых адресов.
+        """
+        super().__init__()
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+
+    def observe(self, log: Mapping, timestamp: int) -> None:
+        remote_addr = log["remote_addr"]
+        counter = self._counters.get(remote_addr)
+        if counter is None:
+            counter = self._counters[remote_addr] = SlidingWindowCounter(self.window_seconds, self.buckets)
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        else:
+            self._counters.move_to_end(remote_addr)
+
+        requests = counter.add(timestamp)
+        if requests > self.max_requests and timestamp >= counter.alerted_until:
+            counter.alerted_until = timestamp + self.window_seconds
+            self.anomalies.append(Anomaly(self.name, remote_addr, timestamp, requests, self.max_requests))
+
+
+class WindowedDetector(AnomalyDetector):
+    """
+    Детектор с последовательными (неперекрывающимися) окнами: записи накапливаются в текущем окне,
+    а при переходе к следующему окну вызывается close_window. Работа при закрытии окна не превышает
+    числа записей в нём, поэтому стоимость обработки одной записи — O(1) амортизированно.
+    """
+
+    def __init__(self, window_seconds: int):
+        """
+        :param window_seconds: Длина окна в секундах.
+        """
+        super().__init__()
+        self.window_seconds = window_seconds
+        self._window = None
+
+    def observe(self, log: Mapping, timestamp: int) -> None:
+        window = timestamp // self.window_seconds
+        if self._window is None:
+            self._window = window
+        elif window > self._window:
+            self.close_window((self._window + 1) * self.window_seconds)
+            self._window = window
+        self.add(log)
+
+    def finish(self) -> None:
+        if self._window is not None:
+            self.close_window((self._window + 1) * self.window_seconds)
+            self._window = None
+
+    @abstractmethod
+    def add(self, log: Mapping) -> None:
+        """
+        Учитывает запись в текущем окне.
+
+        :param log: Строка лога.
+        """
+        pass
+
+    @abstractmethod
+    def close_window(self, timestamp: int) -> None:
+        """
+        Проверяет закрывающееся окно, обновляет базовые значения и сбрасывает накопленное.
+
+        :param timestamp: Время окончания окна (Unix time).
+        """
+        pass
+
+
+class ErrorRateDetector(WindowedDetector):
+    """
+    Находит всплески доли ответов 5xx: доля ошибок в окне сравнивается с экспоненциально
+    сглаженным (EWMA) базовым значением по предыдущим окнам.
+    """
+
+    name = "5xx error rate"
+
+    def __init__(self, window_seconds: int = 60, alpha: float = 0.1, factor: float = 3.0,
+                 min_rate: float = 0.05, min_requests: int = 20):
+        """
+        :param window_seconds: Длина окна в секундах.
+        :param alpha: Вес нового окна в EWMA.
+        :param factor: Во сколько раз доля ошибок должна превышать базовую.
+        :param min_rate: Минимальная доля ошибок, считающаяся аномальной.
+        :param min_requests: Минимальное число запросов в окне для проверки.
+        """
+        super().__init__(window_seconds)
+        self.alpha = alpha
+        self.factor = factor
+        self.min_rate = min_rate
+        self.min_requests = min_requests
+        self.baseline = None
+        self._requests = 0
+        self._errors = 0
+
+    def add(self, log: Mapping) -> None:
+        self._requests += 1
+        if 500 <= int(log["status"]) <= 599:
+            self._errors += 1
+
+    def close_window(self, timestamp: int) -> None:
+        if self._requests >= self.min_requests:
+            rate = self._errors / self._requests
+            if self.baseline is None:
+                self.baseline = rate
+            else:
+                threshold = max(self.baseline * self.factor, self.min_rate)
+                if rate > threshold:
+                    self.anomalies.append(Anomaly(self.name, "5xx", timestamp, round(rate, 4), round(threshold, 4)))
+                self.baseline += self.alpha * (rate - self.baseline)
+        self._requests = 0
+        self._errors = 0
+
+
+class ResourceDominanceDetector(WindowedDetector):
+    """
+    Находит ресурсы, внезапно занявшие большую долю трафика: доля ресурса в окне сравнивается
+    с его EWMA-долей в предыдущих окнах. Число ресурсов в окне и в базовых значениях ограничено max_keys.
+    С нормализатором ресурсы считаются по каноническим путям, как в таблицах отчёта.
+
+    В окнах, где ресурса нет, его доля нулевая, поэтому базовое значение затухает. Затухание применяется
+    лениво, при следующем появлении ресурса: вместе с базовым значением хранится номер окна, в котором
+    оно обновлено, и за каждое пропущенное окно оно умножается на (1 - alpha).
+    """
+
+    name = "Resource dominance"
+
+    def __init__(self, window_seconds: int = 60, alpha: float = 0.1, factor: float = 3.0,
+                 min_share: float = 0.5, min_requests: int = 20, max_keys: int = 10000,
+                 normalizer: ResourceNormalizer | None = None):
+        """
+        :param window_seconds: Длина окна в секундах.
+        :param alpha: Вес нового окна в EWMA.
+        :param factor: Во сколько раз доля ресурса должна превышать базовую.
+        :param min_share: Минимальная доля трафика, считающаяся доминированием.
+        :param min_requests: Минимальное число запросов в окне для проверки.
+        :param max_keys: Максимальное число отслеживаемых ресурсов.
+        :param normalizer: Нормализатор путей ресурсов или None, чтобы считать ресурсы как есть.
+        """
+        super().__init__(window_seconds)
+        self.normalizer = normalizer
+        self.alpha = alpha
+        self.factor = factor
+        self.min_share = min_share
+        self.min_requests = min_requests
+        self.max_keys = max_keys
+        self._requests = 0
+        self._resources = Counter()
+        self._baselines = OrderedDict()
+        self._windows = 0
+
+    def add(self, log: Mapping) -> None:
+        self._requests += 1
+        resource = log["request"] if self.normalizer is None else self.normalizer.normalize(log["request"])
+        if resource in self._resources or len(self._resources) < self.max_keys:
+            self._resources[resource] += 1
+
+    def close_window(self, timestamp: int) -> None:
+        if self._requests >= self.min_requests:
+            for resource, count in self._resources.items():
+                share = count / self._requests
+                stored = self._baselines.get(resource)
+                if stored is not None:
+                    baseline, window = stored
+                    baseline *= (1 - self.alpha) ** (self._windows - window - 1)
+                elif not self._windows:
+                    baseline = share
+                else:
+                    # Ресурс, не встречавшийся в предыдущих окнах, имел в них нулевую долю.
+                    baseline = 0.0
+
+                threshold = max(baseline * self.factor, self.min_share)
+                if share > threshold:
+                    self.anomalies.append(Anomaly(self.name, resource, timestamp, round(share, 4), round(threshold, 4)))
+
+                self._baselines[resource] = (baseline + self.alpha * (share - baseline), self._windows)
+                self._baselines.move_to_end(resource)
+                if len(self._baselines) > self.max_keys:
+                    self._baselines.popitem(last=False)
+            self._windows += 1
+        self._requests = 0
+        self._resources = Counter()
@@ -0,0 +1,318 @@
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime
+from itertools import islice
+from operator import attrgetter, itemgetter
+
+import numpy as np
+
+from src.log_workers.log_record import LogRecord
+
+
+class ColumnarLogs:
+    """
+    Колоночное представление логов для векторизованного анализа на NumPy.
+
+    Каждое поле хранится отдельным массивом целых чисел: статусы и размеры ответов — как есть,
+    дни — как порядковые номера дат, IP-адреса, ресурсы, типы запросов и источники — как коды в словарях значений.
+    Коды выдаются в порядке первого появления значения, поэтому для IP-адресов и ресурсов при равных
+    частотах порядок совпадает с Counter.most_common. Статусы и дни при равных частотах упорядочены
+    по возрастанию значения.
+    """
+
+    LOCALHOST = "localhost"
+    LOCALHOST_IP = "127.0.0.1"
+
+    def __init__(self, statuses: np.ndarray, days: np.ndarray, bytes_sent: np.ndarray,
+                 ip_ids: np.ndarray, resource_ids: np.ndarray, request_type_ids: np.ndarray,
+                 ips: list[str], resources: list[str], request_types: list[str],
+                 source_ids: np.ndarray | None = None, sources: list[str] | None = None):
+        """
+        Инициализирует колоночные логи из готовых массивов.
+
+        :param statuses: Коды статусов ответов.
+        :param days: Дни запросов в виде date.toordinal().
+        :param bytes_sent: Размеры ответов.
+        :param ip_ids: Коды IP-адресов в словаре ips.
+        :param resource_ids: Коды ресурсов в словаре resources.
+        :param request_type_ids: Коды типов запросов в словаре request_types.
+        :param ips: Словарь IP-адресов.
+        :param resources: Словарь ресурсов.
+        :param request_types: Словарь типов запросов.
+        :param source_ids: Коды источников в словаре sources или None, если источники записей неизвестны.
+        :param sources: Словарь источников или None.
+        """
+        self.statuses = statuses
+        self.days = days
+        self.bytes_sent = bytes_sent
+        self.ip_ids = ip_ids
+        self.resource_ids = resource_ids
+        self.request_type_ids = request_type_ids
+        self.ips = ips
+        self.resources = resources
+        self.request_types = request_types
+        self.source_ids = source_ids
+        self.sources = sources
+
+    @staticmethod
+    def from_rows(rows: Iterable[Mapping], batch_size: int = 65536) -> "ColumnarLogs":
+        """
+        Кодирует строки логов (dict или LogRecord) в колоночные массивы за один проход пакетами по batch_size строк.
+
+        :param rows: Строки логов, можно передавать по частям через itertools.chain.
+        :param batch_size: Число строк, кодируемых за раз.
+        :return: Колоночные логи.
+        """
+        builder = ColumnarLogsBuilder(batch_size)
+        rows = iter(rows)
+        while batch := list(islice(rows, batch_size)):
+            builder.add_batch(batch)
+        return builder.build()
+
+    @property
+    def size(self) -> int:
+        """
+        Возвращает число записей.
+
+        :return: Число записей.
+        """
+        return len(self.statuses)
+
+    def select(self, mask: np.ndarray) -> "ColumnarLogs":
+        """
+        Возвращает записи, отмеченные булевой маской. Словари значений разделяются с исходными логами.
+
+        :param mask: Булев массив длины size.
+        :return: Отобранные колоночные логи.
+        """
+        return ColumnarLogs(
+            self.statuses[mask], self.days[mask], self.bytes_sent[mask],
+            self.ip_ids[mask], self.resource_ids[mask], self.request_type_ids[mask],
+            self.ips, self.resources, self.request_types,
+            self.source_ids[mask] if self.source_ids is not None else None, self.sources,
+        )
+
+    def for_source(self, source: str) -> "ColumnarLogs":
+        """
+        Возвращает записи одного источника.
+
+        :param source: Источник.
+        :raises KeyError: Если источники записей неизвестны.
+        :return: Колоночные логи источника (пустые, если записей источника нет).
+        """
+        if self.sources is None:
+            raise KeyError(source)
+        if source not in self.sources:
+            return self.select(np.zeros(self.size, dtype=bool))
+        return self.select(self.source_ids == self.sources.index(source))
+
+    def between_days(self, start_date: date | None, finish_date: date | None) -> "ColumnarLogs":
+        """
+        Отбирает записи между двумя датами включительно.
+
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Отобранные колоночные логи.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        if start_date is not None:
+            mask &= self.days >= start_date.toordinal()
+        if finish_date is not None:
+            mask &= self.days <= finish_date.toordinal()
+        return self.select(mask)
+
+    def most_common_statuses(self, quantity: int | None) -> list[tuple[int, int]]:
+        """
+        Возвращает самые частые статусы с их числами.
+
+        :param quantity: Число статусов или None для всех статусов.
+        :return: Список пар (статус, число).
+        """
+        if not self.size:
+            return []
+        offset = int(self.statuses.min())
+        codes, counts = ColumnarLogs._top_codes(self.statuses - offset, quantity)
+        return [(int(code) + offset, int(count)) for code, count in zip(codes, counts)]
+
+    def most_common_days(self, quantity: int | None) -> list[tuple[date, int]]:
+        """
+        Возвращает дни с наибольшим числом запросов.
+
+        :param quantity: Число дней или None для всех дней.
+        :return: Список пар (дата, число запросов).
+        """
+        if not self.size:
+            return []
+        offset = int(self.days.min())
+        codes, counts = ColumnarLogs._top_codes(self.days - offset, quantity)
+        return [(date.fromordinal(int(code) + offset), int(count)) for code, count in zip(codes, counts)]
+
+    def most_common_ips(self, quantity: int | None) -> list[tuple[str, int]]:
+        """
+        Возвращает самые активные IP-адреса.
+
+        :param quantity: Число адресов или None для всех адресов.
+        :return: Список пар (IP-адрес, число запросов).
+        """
+        codes, counts = ColumnarLogs._top_codes(self.ip_ids, quantity)
+        return [(self.ips[code], int(count)) for code, count in zip(codes, counts)]
+
+    def most_common_resources(self, quantity: int | None, request_type: str) -> list[tuple[str, int]]:
+        """
+        Возвращает самые популярные ресурсы среди запросов заданного типа.
+
+        :param quantity: Число ресурсов или None для всех ресурсов.
+        :param request_type: Тип запроса, например GET.
+        :return: Список пар (ресурс, число запросов).
+        """
+        if request_type not in self.request_types:
+            return []
+        type_code = self.request_types.index(request_type)
+        resource_ids = self.resource_ids[self.request_type_ids == type_code]
+        codes, counts = ColumnarLogs._top_codes(resource_ids, quantity)
+        return [(self.resources[code], int(count)) for code, count in zip(codes, counts)]
+
+    def average_response_size(self) -> float:
+        """
+        Возвращает средний размер ответа.
+
+        :return: Средний размер ответа или 0.0 для пустых логов.
+        """
+        return float(self.bytes_sent.mean()) if self.size else 0.0
+
+    def response_size_percentile(self, percentile: float) -> float:
+        """
+        Возвращает перцентиль размера ответа (линейная интерполяция).
+
+        :param percentile: Перцентиль от 0 до 100.
+        :return: Значение перцентиля или 0.0 для пустых логов.
+        """
+        return float(np.percentile(self.bytes_sent, percentile)) if self.size else 0.0
+
+    @staticmethod
+    def _top_codes(codes: np.ndarray, quantity: int | None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Находит самые частые неотрицательные коды через bincount и argpartition.
+        При равных частотах меньший код идёт раньше.
+
+        :param codes: Массив кодов.
+        :param quantity: Число кодов в ответе или None для всех кодов.
+        :return: Пара массивов (коды, числа).
+        """
+        if (quantity is not None and quantity <= 0) or not len(codes):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        counts = np.bincount(codes)
+        candidates = np.flatnonzero(counts)
+        if quantity is not None and quantity < len(candidates):
+            # Порог top-k находится за O(n), сортируются только кандидаты с числом не меньше порога.
+            threshold = np.partition(counts[candidates], len(candidates) - quantity)[len(candidates) - quantity]
+            candidates = candidates[counts[candidates] >= threshold]
+
+        order = np.lexsort((candidates, -counts[candidates]))[:quantity]
+        top = candidates[order]
+        return top, counts[top]
+
+
+class ColumnarLogsBuilder:
+    """
+    Накопитель колоночных логов: записи кодируются пакетами по мере поступления, а сами записи не хранятся.
+
+    Столбцы пакета извлекаются встроенными map и attrgetter (или itemgetter для dict), числа переводятся
+    в массивы через np.fromiter, а строки кодируются словарями: в Python перебираются только новые
+    значения пакета, а коды всех строк пакета берутся через map без цикла на Python.
+    """
+
+    def __init__(self, batch_size: int = 65536):
+        """
+        :param batch_size: Число записей, после которого накопленные через add записи кодируются.
+        """
+        self.batch_size = batch_size
+        self._pending = []
+        self._columns = {name: [] for name in ("statuses", "days", "bytes_sent", "ip_ids", "resource_ids",
+                                               "request_type_ids", "source_ids")}
+        self._ip_codes, self._resource_codes, self._request_type_codes, self._day_codes = {}, {}, {}, {}
+        self._source_codes = {}
+        self._ips, self._resources, self._request_types, self._sources = [], [], [], []
+
+    def add(self, row: Mapping) -> None:
+        """
+        Добавляет одну запись; записи кодируются пакетами по batch_size.
+
+        :param row: Строка лога (dict или LogRecord).
+        """
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self.add_batch(self._pending)
+            self._pending = []
+
+    def add_batch(self, rows: list[Mapping]) -> None:
+        """
+        Кодирует пакет записей в колоночные массивы.
+
+        :param rows: Строки логов (dict или LogRecord).
+        :raises ValueError: Если дата записи некорректна.
+        """
+        if not rows:
+            return
+        size = len(rows)
+        getter = attrgetter if isinstance(rows[0], LogRecord) else itemgetter
+
+        def column(name: str) -> list:
+            return list(map(getter(name), rows))
+
+        days = [time_local[:11] for time_local in column("time_local")]
+        for day in dict.fromkeys(days).keys() - self._day_codes.keys():
+            self._day_codes[day] = datetime.strptime(day, "%d/%b/%Y").toordinal()
+
+        columns = self._columns
+        columns["statuses"].append(np.fromiter(map(int, column("status")), np.int32, size))
+        columns["days"].append(np.fromiter(map(self._day_codes.__getitem__, days), np.int32, size))
+        columns["bytes_sent"].append(np.fromiter(map(int, column("body_bytes_sent")), np.int64, size))
+        columns["ip_ids"].append(ColumnarLogsBuilder._encode(
+            column("remote_addr"), self._ip_codes, self._ips, {ColumnarLogs.LOCALHOST: ColumnarLogs.LOCALHOST_IP}
+        ))
+        columns["resource_ids"].append(ColumnarLogsBuilder._encode(column("request"), self._resource_codes,
+                                                                   self._resources))
+        columns["request_type_ids"].append(ColumnarLogsBuilder._encode(column("request_type"),
+                                                                       self._request_type_codes, self._request_types))
+        sources = column("source") if getter is attrgetter else [row.get("source", "") for row in rows]
+        columns["source_ids"].append(ColumnarLogsBuilder._encode(sources, self._source_codes, self._sources))
+
+    def build(self) -> ColumnarLogs:
+        """
+        Кодирует оставшиеся записи и собирает колоночные логи.
+
+        :return: Колоночные логи по всем добавленным записям.
+        """
+        self.add_batch(self._pending)
+        self._pending = []
+        columns = {
+            name: np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int32)
+            for name, chunks in self._columns.items()
+        }
+        columns["bytes_sent"] = columns["bytes_sent"].astype(np.int64, copy=False)
+        return ColumnarLogs(**columns, ips=self._ips, resources=self._resources, request_types=self._request_types,
+                            sources=self._sources)
+
+    @staticmethod
+    def _encode(values: list[str], codes: dict[str, int], names: list[str],
+                aliases: dict[str, str] | None = None) -> np.ndarray:
+        """
+        Заменяет строки кодами, добавляя новые значения в словарь в порядке первого появления.
+
+        :param values: Значения столбца пакета.
+        :param codes: Словарь: значение -> код, общий для всех пакетов.
+        :param names: Значения по кодам, общие для всех пакетов.
+        :param aliases: Значения, которые кодируются так же, как другое значение (например, localhost и 127.0.0.1).
+        :return: Массив кодов.
+        """
+        for value in dict.fromkeys(values):
+            if value in codes:
+                continue
+            name = aliases.get(value, value) if aliases else value
+            code = codes.get(name)
+            if code is None:
+                code = codes[name] = len(names)
+                names.append(name)
+            codes[value] = code
+        return np.fromiter(map(codes.__getitem__, values), np.int32, len(values))
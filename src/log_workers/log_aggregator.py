@@ -0,0 +1,318 @@
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from datetime import date
+
+from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.resource_normalizer import ResourceNormalizer
+
+
+class DayAggregates:
+    """
+    Агрегаты логов за один день: число запросов, суммарный размер ответов и счётчики
+    статусов, пользователей и ресурсов (по типам запросов).
+    """
+
+    __slots__ = ("requests", "bytes_sent", "statuses", "users", "resources")
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes_sent = 0
+        self.statuses = Counter()
+        self.users = Counter()
+        self.resources = {}
+
+
+class LogAggregator:
+    """
+    Класс для инкрементального накопления статистик по логам.
+
+    Записи добавляются по мере поступления, а статистики за любой диапазон дат считаются по
+    подневным агрегатам без повторного просмотра строк. Поле version увеличивается при каждом
+    добавлении данных и позволяет инвалидировать закэшированные ответы.
+    """
+
+    def __init__(self, normalizer: ResourceNormalizer | None = None):
+        """
+        Инициализирует пустой агрегатор.
+
+        :param normalizer: Нормализатор путей ресурсов или None, чтобы считать ресурсы как есть.
+                           С нормализатором в агрегатах хранятся только канонические пути.
+        """
+        self._days = {}
+        self.normalizer = normalizer
+        self.version = 0
+
+    def add_rows(self, rows: Iterable[Mapping], on_error: Callable[[Mapping, Exception], None] | None = None) -> int:
+        """
+        Добавляет записи логов в агрегаты. Если хотя бы одна запись добавлена, version увеличивается,
+        даже когда обработка прервана ошибкой.
+
+        :param rows: Строки логов (dict или LogRecord).
+        :param on_error: Функция, которая получает запись, которую не удалось добавить (например, с некорректной
+                         датой), и ошибку; после неё обработка продолжается. Если None, ошибка пробрасывается.
+        :raises ValueError: Если запись некорректна и on_error не задан.
+        :raises KeyError: Если в записи нет нужного поля и on_error не задан.
+        :return: Число добавленных записей.
+        """
+        added = 0
+        try:
+            for row in rows:
+                try:
+                    self.add_row(row)
+                except (KeyError, ValueError) as error:
+                    if on_error is None:
+                        raise
+                    on_error(row, error)
+                    continue
+                added += 1
+        finally:
+            if added:
+                self.version += 1
+        return added
+
+    def add_row(self, row: Mapping) -> None:
+        """
+        Добавляет одну запись лога в агрегаты её дня. Не меняет version: для пакетов используйте add_rows.
+
+        :param row: Строка лога.
+        """
+        day = LogAnalyser.get_log_date(row)
+        aggregates = self._days.get(day)
+        if aggregates is None:
+            aggregates = self._days[day] = DayAggregates()
+
+        remote_addr = row["remote_addr"]
+        aggregates.requests += 1
+        aggregates.bytes_sent += int(row["body_bytes_sent"])
+        aggregates.statuses[int(row["status"])] += 1
+        aggregates.users[remote_addr if remote_addr != "localhost" else LogAnalyser.LOCALHOST_IP] += 1
+
+        resources = aggregates.resources.get(row["request_type"])
+        if resources is None:
+            resources = aggregates.resources[row["request_type"]] = Counter()
+        resources[row["request"] if self.normalizer is None else self.normalizer.normalize(row["request"])] += 1
+
+    def add_day_aggregates(self, day: date, other: DayAggregates) -> None:
+        """
+        Добавляет готовые агрегаты дня (например, загруженные из хранилища свёрток) к агрегатам этого дня.
+
+        :param day: День.
+        :param other: Агрегаты, которые нужно добавить.
+        """
+        aggregates = self._days.get(day)
+        if aggregates is None:
+            aggregates = self._days[day] = DayAggregates()
+
+        aggregates.requests += other.requests
+        aggregates.bytes_sent += other.bytes_sent
+        aggregates.statuses.update(other.statuses)
+        aggregates.users.update(other.users)
+        for request_type, resources in other.resources.items():
+            aggregates.resources.setdefault(request_type, Counter()).update(resources)
+        self.version += 1
+
+    def between_days(self, start_date: date | None = None, finish_date: date | None = None,
+                     sources: dict[str, "LogAggregator"] | None = None) -> "AggregatedLogs":
+        """
+        Возвращает логи агрегатора за период в виде, который принимают методы LogAnalyser.
+
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :param sources: Агрегаторы отдельных источников для разбивки по источникам или None.
+        :return: Агрегированные логи за период.
+        """
+        return AggregatedLogs(self, start_date, finish_date, sources)
+
+    def get_days(self, start_date: date | None = None, finish_date: date | None = None) -> list[date]:
+        """
+        Возвращает дни с данными между двумя датами включительно в хронологическом порядке.
+
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Список дней.
+        """
+        return sorted(
+            day for day in self._days
+            if (start_date is None or day >= start_date) and (finish_date is None or day <= finish_date)
+        )
+
+    def get_day_aggregates(self, day: date) -> DayAggregates | None:
+        """
+        Возвращает агрегаты за день.
+
+        :param day: День.
+        :return: Агрегаты или None, если данных за день нет.
+        """
+        return self._days.get(day)
+
+    def get_requests_quantity(self, start_date: date | None = None, finish_date: date | None = None) -> int:
+        """
+        Возвращает число запросов за период.
+
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Число запросов.
+        """
+        return sum(self._days[day].requests for day in self.get_days(start_date, finish_date))
+
+    def get_average_response_size(self, start_date: date | None = None, finish_date: date | None = None) -> float:
+        """
+        Возвращает средний размер ответа за период.
+
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Средний размер ответа или 0.0, если запросов нет.
+        """
+        days = [self._days[day] for day in self.get_days(start_date, finish_date)]
+        requests = sum(aggregates.requests for aggregates in days)
+        return sum(aggregates.bytes_sent for aggregates in days) / requests if requests else 0.0
+
+    def get_the_most_popular_statuses(self, quantity: int, start_date: date | None = None,
+                                      finish_date: date | None = None) -> list[tuple[int, int]]:
+        """
+        Возвращает самые частые статусы за период.
+
+        :param quantity: Число статусов.
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Список пар (статус, число ответов).
+        """
+        return self._merge(
+            (self._days[day].statuses for day in self.get_days(start_date, finish_date)), quantity
+        )
+
+    def get_the_most_active_users(self, quantity: int, start_date: date | None = None,
+                                  finish_date: date | None = None) -> list[tuple[str, int]]:
+        """
+        Возвращает самых активных пользователей за период.
+
+        :param quantity: Число пользователей.
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Список пар (IP-адрес, число запросов).
+        """
+        return self._merge(
+            (self._days[day].users for day in self.get_days(start_date, finish_date)), quantity
+        )
+
+    def get_the_most_popular_resources(self, quantity: int, start_date: date | None = None,
+                                       finish_date: date | None = None,
+                                       request: str = "GET") -> list[tuple[str, int]]:
+        """
+        Возвращает самые популярные ресурсы среди запросов заданного типа за период.
+
+        :param quantity: Число ресурсов.
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :param request: Тип запроса.
+        :return: Список пар (ресурс, число запросов).
+        """
+        return self._merge(
+            (self._days[day].resources.get(request, Counter()) for day in self.get_days(start_date, finish_date)),
+            quantity
+        )
+
+    def get_the_most_high_loaded_days(self, quantity: int, start_date: date | None = None,
+                                      finish_date: date | None = None) -> list[tuple[date, int]]:
+        """
+        Возвращает дни с наибольшим числом запросов за период.
+
+        :param quantity: Число дней.
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Список пар (день, число запросов).
+        """
+        day_counts = Counter({day: self._days[day].requests for day in self.get_days(start_date, finish_date)})
+        return day_counts.most_common(quantity)
+
+    @staticmethod
+    def _merge(counters: Iterable[Counter], quantity: int) -> list[tuple]:
+        """
+        Складывает счётчики и возвращает самые частые значения.
+
+        :param counters: Счётчики за отдельные дни.
+        :param quantity: Число значений.
+        :return: Список пар (значение, число).
+        """
+        total = Counter()
+        for counter in counters:
+            total.update(counter)
+        return total.most_common(quantity)
+
+
+class AggregatedLogs:
+    """
+    Логи за период, представленные подневными агрегатами LogAggregator.
+
+    Предоставляет те же методы подсчёта, что и ColumnarLogs, поэтому LogAnalyser и StatsPrinter
+    строят по ним отчёты без исходных строк. Перцентили размеров по агрегатам посчитать нельзя.
+    Если заданы агрегаторы отдельных источников, по ним строится разбивка отчётов по источникам.
+    """
+
+    def __init__(self, aggregator: LogAggregator, start_date: date | None = None, finish_date: date | None = None,
+                 sources: dict[str, LogAggregator] | None = None):
+        """
+        :param aggregator: Агрегатор с подневными агрегатами.
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :param sources: Словарь: источник -> агрегатор записей этого источника, или None.
+        """
+        self.aggregator = aggregator
+        self.start_date = start_date
+        self.finish_date = finish_date
+        self.sources = sources
+
+    @property
+    def size(self) -> int:
+        """
+        Возвращает число записей за период.
+
+        :return: Число записей.
+        """
+        return self.aggregator.get_requests_quantity(self.start_date, self.finish_date)
+
+    def between_days(self, start_date: date | None, finish_date: date | None) -> "AggregatedLogs":
+        """
+        Сужает период до пересечения с заданным.
+
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Агрегированные логи за суженный период.
+        """
+        if start_date is None or (self.start_date is not None and self.start_date > start_date):
+            start_date = self.start_date
+        if finish_date is None or (self.finish_date is not None and self.finish_date < finish_date):
+            finish_date = self.finish_date
+        return AggregatedLogs(self.aggregator, start_date, finish_date, self.sources)
+
+    def for_source(self, source: str) -> "AggregatedLogs":
+        """
+        Возвращает логи одного источника за тот же период.
+
+        :param source: Источник.
+        :raises KeyError: Если агрегатора источника нет.
+        :return: Агрегированные логи источника.
+        """
+        return AggregatedLogs(self.sources[source], self.start_date, self.finish_date)
+
+    def most_common_statuses(self, quantity: int | None) -> list[tuple[int, int]]:
+        return self.aggregator.get_the_most_popular_statuses(quantity, self.start_date, self.finish_date)
+
+    def most_common_days(self, quantity: int | None) -> list[tuple[date, int]]:
+        return self.aggregator.get_the_most_high_loaded_days(quantity, self.start_date, self.finish_date)
+
+    def most_common_ips(self, quantity: int | None) -> list[tuple[str, int]]:
+        return self.aggregator.get_the_most_active_users(quantity, self.start_date, self.finish_date)
+
+    def most_common_resources(self, quantity: int | None, request_type: str) -> list[tuple[str, int]]:
+        return self.aggregator.get_the_most_popular_resources(quantity, self.start_date, self.finish_date,
+                                                              request_type)
+
+    def average_response_size(self) -> float:
+        return self.aggregator.get_average_response_size(self.start_date, self.finish_date)
+
+    def response_size_percentile(self, percentile: float) -> float:
+        """
+        :raises ValueError: Всегда: подневные агрегаты не хранят распределение размеров.
+        """
+        raise ValueError("Response size percentiles are not available for aggregated logs")
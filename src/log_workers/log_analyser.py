@@ -1,16 +1,83 @@
+import sys
 from datetime import datetime, date
 from collections import Counter
+from collections.abc import Callable
+from functools import lru_cache
 
 from src.table import Table
 
+# Модуль колоночного backend импортирует NumPy, поэтому он не загружается вместе с анализатором.
+COLUMNAR_LOGS_MODULE = "src.log_workers.columnar_logs"
+# Модуль агрегатора сам импортирует анализатор, поэтому проверяется так же, без импорта.
+AGGREGATED_LOGS_MODULE = "src.log_workers.log_aggregator"
+
 
 class LogAnalyser:
     """
     Класс для анализа логов и получения различных статистик по данным логов.
+
+    Кроме Table методы принимают ColumnarLogs (подсчёты выполняются векторизованно на NumPy)
+    и AggregatedLogs (ответы берутся из подневных агрегатов).
     """
 
     LOCALHOST_IP = "127.0.0.1"
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_day(day: str) -> date:
+        """
+        Преобразует дату из начала поля time_local (например, 08/Nov/2024) в date.
+        Результат кэшируется, поэтому strptime вызывается один раз на каждый день, а не на каждую строку.
+
+        :param day: Первые 11 символов поля time_local.
+        :return: Дата.
+        """
+        return datetime.strptime(day, "%d/%b/%Y").date()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_minute(minute: str, utc_offset: str) -> int:
+        """
+        Преобразует минуту из поля time_local (например, 08/Nov/2024:10:52) и смещение часового пояса в Unix time.
+        Результат кэшируется, поэтому strptime вызывается один раз на каждую минуту.
+
+        :param minute: Первые 17 символов поля time_local.
+        :param utc_offset: Смещение часового пояса, например +0000.
+        :return: Unix time начала минуты.
+        """
+        return int(datetime.strptime(minute + utc_offset, "%d/%b/%Y:%H:%M%z").timestamp())
+
+    @staticmethod
+    def parse_time_local(time_local: str) -> int:
+        """
+        Преобразует поле time_local (например, 08/Nov/2024:10:52:20 +0000) в Unix time.
+
+        :param time_local: Значение поля time_local.
+        :raises ValueError: Если дата или время некорректны (например, несуществующий месяц).
+        :return: Unix time.
+        """
+        return LogAnalyser._parse_minute(time_local[:17], time_local[21:]) + int(time_local[18:20])
+
+    @staticmethod
+    def get_log_timestamp(log) -> int:
+        """
+        Возвращает время записи лога по полю time_local.
+
+        :param log: Строка таблицы логов.
+        :return: Unix time запроса.
+        """
+        return LogAnalyser.parse_time_local(log["time_local"])
+
+    @staticmethod
+    def get_log_date(log) -> date:
+        """
+        Возвращает дату записи лога по полю time_local (в часовом поясе самой записи).
+
+        :param log: Строка таблицы логов.
+        :return: Дата запроса.
+        """
+        return LogAnalyser._parse_day(log["time_local"][:11])
+
     @staticmethod
     def get_requests_quantity(logs: Table) -> int:
         """
@@ -22,47 +89,119 @@ class LogAnalyser:
         return logs.size
 
     @staticmethod
-    def get_the_most_popular_resources(logs: Table, quantity: int, request: str = "GET") -> Table:
+    def is_columnar(logs) -> bool:
+        """
+        Проверяет, переданы ли логи в колоночном представлении NumPy. Если модуль колоночного backend
+        ещё не загружен, колоночных логов быть не может, и NumPy не импортируется.
+
+        :param logs: Таблица логов или ColumnarLogs.
+        :return: True, если логи колоночные.
+        """
+        columnar_logs = sys.modules.get(COLUMNAR_LOGS_MODULE)
+        return columnar_logs is not None and isinstance(logs, columnar_logs.ColumnarLogs)
+
+    @staticmethod
+    def is_precomputed(logs) -> bool:
+        """
+        Проверяет, считают ли логи статистики сами (ColumnarLogs или AggregatedLogs), без просмотра строк.
+
+        :param logs: Таблица логов, ColumnarLogs или AggregatedLogs.
+        :return: True, если логи колоночные или агрегированные.
+        """
+        if LogAnalyser.is_columnar(logs):
+            return True
+        log_aggregator = sys.modules.get(AGGREGATED_LOGS_MODULE)
+        return log_aggregator is not None and isinstance(logs, log_aggregator.AggregatedLogs)
+
+    @staticmethod
+    def has_source_breakdown(logs) -> bool:
+        """
+        Проверяет, можно ли разбить статистики логов по источникам: строки Table помечены источником,
+        колоночные логи должны хранить коды источников, а агрегированные — агрегаты каждого источника.
+
+        :param logs: Таблица логов, ColumnarLogs или AggregatedLogs.
+        :return: True, если разбивка по источникам доступна.
+        """
+        if not LogAnalyser.is_precomputed(logs):
+            return True
+        return getattr(logs, "sources", None) is not None
+
+    @staticmethod
+    def get_the_most_popular_resources(logs: Table, quantity: int, request: str = "GET",
+                                       sources: list[str] | None = None, normalizer=None) -> Table:
         """
        Возвращает самые популярные ресурсы из логов, отфильтрованных по типу запроса.
 
        :param logs: Таблица логов.
        :param quantity: Число популярных ресурсов для вывода.
        :param request: Тип запроса, по которому происходит фильтрация.
+       :param sources: Источники, для которых нужно добавить столбцы с разбивкой, или None.
+       :param normalizer: ResourceNormalizer, по каноническим путям которого группируются ресурсы, или None.
        :return: Таблица с популярными ресурсами и их числами.
        """
-        sorted_logs = [
-            log["request"] for log in logs.rows
-            if log.get("request_type") == request
-        ]
-        resource_counts = Counter(sorted_logs)
-        sorted_resources = resource_counts.most_common(quantity)
+        normalize = normalizer.normalize if normalizer is not None else None
+        if LogAnalyser.is_precomputed(logs) and normalize is None:
+            sorted_resources = logs.most_common_resources(quantity, request)
+        elif LogAnalyser.is_precomputed(logs):
+            resource_counts = Counter()
+            for resource, count in logs.most_common_resources(None, request):
+                resource_counts[normalize(resource)] += count
+            sorted_resources = resource_counts.most_common(quantity)
+        else:
+            sorted_logs = [
+                log["request"] if normalize is None else normalize(log["request"]) for log in logs.rows
+                if log.get("request_type") == request
+            ]
+            resource_counts = Counter(sorted_logs)
+            sorted_resources = resource_counts.most_common(quantity)
 
-        return Table([
+        resources = Table([
             {"resource": resource, "value": str(count)}
             for resource, count in sorted_resources
         ])
+        def source_counts(source_logs) -> Counter:
+            counts = Counter()
+            for resource, count in source_logs.most_common_resources(None, request):
+                counts[resource if normalize is None else normalize(resource)] += count
+            return counts
+
+        return LogAnalyser.add_source_breakdown(
+            resources, "resource", logs,
+            lambda log: None if log.get("request_type") != request
+            else log["request"] if normalize is None else normalize(log["request"]),
+            sources, source_counts
+        )
 
     @staticmethod
-    def get_the_most_popular_statuses(logs: Table, quantity: int) -> Table:
+    def get_the_most_popular_statuses(logs: Table, quantity: int, sources: list[str] | None = None) -> Table:
         """
         Возвращает самые популярные статусы ответов из логов.
 
         :param logs: Таблица логов.
         :param quantity: Число статусов для вывода.
+        :param sources: Источники, для которых нужно добавить столбцы с разбивкой, или None.
         :return: Таблица с популярными статусами и их числами.
         """
-        sorted_logs = [
-            log["status"] for log in logs.rows
-            if log.get("status") is not None
-        ]
-        status_counts = Counter(sorted_logs)
-        sorted_statuses = status_counts.most_common(quantity)
+        if LogAnalyser.is_precomputed(logs):
+            sorted_statuses = logs.most_common_statuses(quantity)
+        else:
+            sorted_logs = [
+                log["status"] for log in logs.rows
+                if log.get("status") is not None
+            ]
+            status_counts = Counter(sorted_logs)
+            sorted_statuses = status_counts.most_common(quantity)
 
-        return Table([
-            {"status": status, "responses": str(count)}
+        statuses = Table([
+            {"status": str(status), "responses": str(count)}
             for status, count in sorted_statuses
         ])
+        return LogAnalyser.add_source_breakdown(
+            statuses, "status", logs, lambda log: str(log.get("status")), sources,
+            lambda source_logs: Counter({
+                str(status): count for status, count in source_logs.most_common_statuses(None)
+            })
+        )
 
     @staticmethod
     def get_average_response_size(logs: Table) -> float:
@@ -72,6 +211,9 @@ class LogAnalyser:
         :param logs: Таблица логов.
         :return: Средний размер ответа.
         """
+        if LogAnalyser.is_precomputed(logs):
+            return logs.average_response_size()
+
         body_bytes_sent = [
             float(log["body_bytes_sent"]) for log in logs.rows
             if log.get("body_bytes_sent") is not None
@@ -79,46 +221,202 @@ class LogAnalyser:
         return sum(body_bytes_sent) / len(body_bytes_sent) if body_bytes_sent else 0.0
 
     @staticmethod
-    def get_the_most_high_loaded_days(logs: Table, quantity: int) -> Table:
+    def get_response_size_percentile(logs: Table, percentile: float = 95) -> float:
+        """
+        Возвращает перцентиль размера ответа (body_bytes_sent) с линейной интерполяцией,
+        как numpy.percentile.
+
+        :param logs: Таблица логов.
+        :param percentile: Перцентиль от 0 до 100.
+        :return: Значение перцентиля или 0.0, если размеров нет.
+        """
+        if LogAnalyser.is_precomputed(logs):
+            return logs.response_size_percentile(percentile)
+
+        body_bytes_sent = sorted(
+            float(log["body_bytes_sent"]) for log in logs.rows
+            if log.get("body_bytes_sent") is not None
+        )
+        if not body_bytes_sent:
+            return 0.0
+
+        position = (len(body_bytes_sent) - 1) * percentile / 100
+        lower = int(position)
+        upper = min(lower + 1, len(body_bytes_sent) - 1)
+        return body_bytes_sent[lower] + (body_bytes_sent[upper] - body_bytes_sent[lower]) * (position - lower)
+
+    @staticmethod
+    def get_the_most_high_loaded_days(logs: Table, quantity: int, sources: list[str] | None = None) -> Table:
         """
         Возвращает дни с наибольшей нагрузкой по количеству запросов.
 
         :param logs: Таблица логов.
         :param quantity: Число дней для вывода.
+        :param sources: Источники, для которых нужно добавить столбцы с разбивкой, или None.
         :return: Таблица с днями и числами запросов.
         """
-        sorted_logs = [
-            datetime.strptime(log["time_local"], "%d/%b/%Y:%H:%M:%S %z").date()
-            for log in logs.rows if log.get("time_local") is not None
-        ]
-        day_counts = Counter(sorted_logs)
-        sorted_days = day_counts.most_common(quantity)
+        if LogAnalyser.is_precomputed(logs):
+            sorted_days = logs.most_common_days(quantity)
+        else:
+            sorted_logs = [
+                LogAnalyser.get_log_date(log)
+                for log in logs.rows if log.get("time_local") is not None
+            ]
+            day_counts = Counter(sorted_logs)
+            sorted_days = day_counts.most_common(quantity)
 
-        return Table([
+        days = Table([
             {"day": str(day), "requests": str(count)}
             for day, count in sorted_days
         ])
+        return LogAnalyser.add_source_breakdown(
+            days, "day", logs, lambda log: str(LogAnalyser.get_log_date(log)), sources,
+            lambda source_logs: Counter({str(day): count for day, count in source_logs.most_common_days(None)})
+        )
 
     @staticmethod
-    def get_the_most_active_users(logs: Table, quantity: int) -> Table:
+    def get_the_most_active_users(logs: Table, quantity: int, sources: list[str] | None = None) -> Table:
         """
         Возвращает самых активных пользователей по числу запросов.
 
         :param logs: Таблица логов.
         :param quantity: Число пользователей для вывода.
+        :param sources: Источники, для которых нужно добавить столбцы с разбивкой, или None.
         :return: Таблица с IP-адресами пользователей и числами запросов.
         """
-        sorted_logs = [
-            log["remote_addr"] if log["remote_addr"] != "localhost" else LogAnalyser.LOCALHOST_IP
-            for log in logs.rows if log.get("remote_addr") is not None
-        ]
-        user_counts = Counter(sorted_logs)
-        sorted_users = user_counts.most_common(quantity)
+        if LogAnalyser.is_precomputed(logs):
+            sorted_users = logs.most_common_ips(quantity)
+        else:
+            sorted_logs = [
+                log["remote_addr"] if log["remote_addr"] != "localhost" else LogAnalyser.LOCALHOST_IP
+                for log in logs.rows if log.get("remote_addr") is not None
+            ]
+            user_counts = Counter(sorted_logs)
+            sorted_users = user_counts.most_common(quantity)
 
-        return Table([
+        users = Table([
             {"user_ip": user_ip, "requests": str(count)}
             for user_ip, count in sorted_users
         ])
+        return LogAnalyser.add_source_breakdown(
+            users, "user_ip", logs,
+            lambda log: log["remote_addr"] if log["remote_addr"] != "localhost" else LogAnalyser.LOCALHOST_IP,
+            sources, lambda source_logs: Counter(dict(source_logs.most_common_ips(None)))
+        )
+
+    @staticmethod
+    def add_source_breakdown(table: Table, key_column: str, logs: Table, key_function,
+                             sources: list[str] | None, source_counts_function=None) -> Table:
+        """
+        Добавляет в таблицу топ-N по столбцу на каждый источник с числом записей этого источника для каждого ключа.
+        Логи просматриваются один раз, а счётчики хранятся только для ключей из таблицы. Для колоночных логов
+        и агрегированных логов с агрегатами источников числа берутся из счётчиков каждого источника.
+        Для агрегированных логов без агрегатов источников и при отсутствии источников таблица возвращается
+        без изменений.
+
+        :param table: Таблица топ-N.
+        :param key_column: Столбец таблицы с ключами.
+        :param logs: Таблица логов, записи которых помечены источником (столбец source), ColumnarLogs
+                     или AggregatedLogs.
+        :param key_function: Функция, возвращающая ключ записи лога в том же виде, что и в key_column.
+        :param sources: Источники, для которых нужны столбцы, или None.
+        :param source_counts_function: Функция, возвращающая по агрегированным логам источника счётчик
+                                       ключей в том же виде, что и в key_column, или None.
+        :return: Таблица со столбцами по источникам.
+        """
+        if not sources or not LogAnalyser.has_source_breakdown(logs):
+            return table
+
+        breakdown = {row[key_column]: Counter() for row in table.rows}
+        if LogAnalyser.is_precomputed(logs):
+            if source_counts_function is None:
+                return table
+            for source in sources:
+                counts = source_counts_function(logs.for_source(source))
+                for key, source_counts in breakdown.items():
+                    source_counts[source] = counts[key]
+        else:
+            for log in logs.rows:
+                source_counts = breakdown.get(key_function(log))
+                if source_counts is not None:
+                    source_counts[log.get("source")] += 1
+
+        return Table([
+            {**row, **{source: str(breakdown[row[key_column]][source]) for source in sources}}
+            for row in table.rows
+        ])
+
+    @staticmethod
+    def get_sources_summary(logs: Table, sources: list[str]) -> dict[str, tuple[int, float]]:
+        """
+        Возвращает для каждого источника число запросов и средний размер ответа за один проход по логам.
+
+        :param logs: Таблица логов, записи которых помечены источником (столбец source),
+                     ColumnarLogs или AggregatedLogs с агрегатами источников.
+        :param sources: Источники.
+        :return: Словарь: источник -> (число запросов, средний размер ответа).
+        """
+        if LogAnalyser.is_precomputed(logs):
+            return {
+                source: (logs.for_source(source).size, logs.for_source(source).average_response_size())
+                for source in sources
+            }
+
+        requests = Counter()
+        body_bytes_sent = Counter()
+        for log in logs.rows:
+            source = log.get("source")
+            requests[source] += 1
+            body_bytes_sent[source] += int(log["body_bytes_sent"])
+
+        return {
+            source: (requests[source], body_bytes_sent[source] / requests[source] if requests[source] else 0.0)
+            for source in sources
+        }
+
+    @staticmethod
+    def detect_anomalies(logs: Table, detectors: list) -> list:
+        """
+        Пропускает логи через потоковые детекторы аномалий за один проход и возвращает найденные аномалии,
+        упорядоченные по времени.
+
+        :param logs: Таблица логов, упорядоченных по времени.
+        :param detectors: Список детекторов AnomalyDetector.
+        :return: Список аномалий Anomaly.
+        """
+        for log in logs.rows:
+            LogAnalyser.observe_anomalies(log, detectors)
+        return LogAnalyser.collect_anomalies(detectors)
+
+    @staticmethod
+    def observe_anomalies(log, detectors: list) -> None:
+        """
+        Передаёт одну запись потоковым детекторам аномалий. Записи должны передаваться в порядке времени.
+
+        :param log: Строка лога.
+        :param detectors: Список детекторов AnomalyDetector.
+        """
+        if log.get("time_local") is None:
+            return
+        timestamp = LogAnalyser.get_log_timestamp(log)
+        for detector in detectors:
+            detector.observe(log, timestamp)
+
+    @staticmethod
+    def collect_anomalies(detectors: list) -> list:
+        """
+        Завершает работу детекторов после последней записи и возвращает найденные аномалии,
+        упорядоченные по времени.
+
+        :param detectors: Список детекторов AnomalyDetector.
+        :return: Список аномалий Anomaly.
+        """
+        for detector in detectors:
+            detector.finish()
+        return sorted(
+            (anomaly for detector in detectors for anomaly in detector.anomalies),
+            key=lambda anomaly: anomaly.timestamp
+        )
 
     @staticmethod
     def get_date_constrained_logs(logs: Table,
@@ -126,18 +424,37 @@ class LogAnalyser:
                                   finish_date: date | None = None) -> Table:
         """
         Получает логи между двумя заданными датами (крайние даты учитываются).
+        Для Table результат — ленивое представление с одним условием: дата каждой строки
+        вычисляется один раз, а отбор выполняется при первом обращении к представлению.
 
         :param logs: Таблица логов.
         :param start_date: Начальная дата.
         :param finish_date: Конечная дата.
         :return: Таблица логов, удовлетворяющая ограничениям по датам.
         """
-        constrained_logs = logs
-        if start_date is not None:
-            constrained_logs = LogAnalyser.set_from_date_constraint(constrained_logs, start_date)
-        if finish_date is not None:
-            constrained_logs = LogAnalyser.set_to_date_constraint(constrained_logs, finish_date)
-        return constrained_logs
+        if LogAnalyser.is_precomputed(logs):
+            return logs.between_days(start_date, finish_date)
+        if start_date is None and finish_date is None:
+            return logs
+
+        return logs.filter(LogAnalyser.get_date_predicate(start_date, finish_date))
+
+    @staticmethod
+    def get_date_predicate(start_date: date | None = None, finish_date: date | None = None) -> Callable[..., bool]:
+        """
+        Возвращает условие, которому удовлетворяют записи между двумя датами (крайние даты учитываются).
+
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :return: Функция, принимающая строку лога и возвращающая True, если запись попадает в период.
+        """
+        def is_between(log) -> bool:
+            if log.get("time_local") is None:
+                return False
+            day = LogAnalyser.get_log_date(log)
+            return (start_date is None or day >= start_date) and (finish_date is None or day <= finish_date)
+
+        return is_between
 
     @staticmethod
     def set_from_date_constraint(logs: Table, start_date: date) -> Table:
@@ -146,13 +463,14 @@ class LogAnalyser:
 
         :param logs: Таблица логов.
         :param start_date: Начальная дата.
-        :return: Таблица с логами начиная с указанной даты.
+        :return: Представление таблицы с логами начиная с указанной даты.
         """
-        return Table([
-            log for log in logs.rows
-            if log.get("time_local") is not None and
-            datetime.strptime(log["time_local"], "%d/%b/%Y:%H:%M:%S %z").date() >= start_date
-        ])
+        if LogAnalyser.is_precomputed(logs):
+            return logs.between_days(start_date, None)
+
+        return logs.filter(
+            lambda log: log.get("time_local") is not None and LogAnalyser.get_log_date(log) >= start_date
+        )
 
     @staticmethod
     def set_to_date_constraint(logs: Table, finish_date: date) -> Table:
@@ -161,10 +479,11 @@ class LogAnalyser:
 
         :param logs: Таблица логов.
         :param finish_date: Конечная дата для.
-        :return: Таблица с логами до указанной даты.
+        :return: Представление таблицы с логами до указанной даты.
         """
-        return Table([
-            log for log in logs.rows
-            if log.get("time_local") is not None and
-            datetime.strptime(log["time_local"], "%d/%b/%Y:%H:%M:%S %z").date() <= finish_date
-        ])
+        if LogAnalyser.is_precomputed(logs):
+            return logs.between_days(None, finish_date)
+
+        return logs.filter(
+            lambda log: log.get("time_local") is not None and LogAnalyser.get_log_date(log) <= finish_date
+        )
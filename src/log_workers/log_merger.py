@@ -0,0 +1,54 @@
+import heapq
+from collections.abc import Iterable, Iterator
+
+from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.log_pipeline import LogPipeline
+from src.log_workers.log_record import LogRecord
+from src.log_workers.log_rejects import RejectCollector
+
+
+class LogMerger:
+    """
+    Класс для слияния нескольких источников логов в единый поток, упорядоченный по времени.
+
+    Каждый источник должен быть упорядочен по времени (как обычные логи NGINX). Источники читаются
+    лениво и сливаются k-путевым слиянием на куче, поэтому в памяти одновременно находится
+    не больше нескольких пакетов записей от каждого источника, независимо от их размера.
+    """
+
+    @staticmethod
+    def read_records(source: str, rejects: RejectCollector | None = None) -> Iterator[LogRecord]:
+        """
+        Лениво читает и парсит записи одного источника, помечая каждую запись источником.
+        Чтение и парсинг идут в собственном конвейере LogPipeline источника, поэтому в памяти
+        находится не больше нескольких пакетов записей, а чтение не ждёт потребителя.
+
+        :param source: Путь к локальному файлу или URL.
+        :param rejects: Учёт отброшенных строк или None, чтобы отбрасывать их молча.
+        :return: Итератор по записям источника.
+        """
+        for _, records in LogPipeline([source], rejects).batches():
+            yield from records
+
+    @staticmethod
+    def merge(sources: list[str], rejects: RejectCollector | None = None) -> Iterator[LogRecord]:
+        """
+        Сливает источники в один поток записей в порядке времени. При равном времени раньше идут
+        записи источника, указанного раньше в списке.
+
+        :param sources: Пути к локальным файлам или URL.
+        :param rejects: Учёт отброшенных строк или None, чтобы отбрасывать их молча.
+        :return: Ленивый итератор по записям всех источников.
+        """
+        return LogMerger.merge_records([LogMerger.read_records(source, rejects) for source in sources])
+
+    @staticmethod
+    def merge_records(streams: list[Iterable[LogRecord]]) -> Iterator[LogRecord]:
+        """
+        Сливает упорядоченные по времени потоки записей в один поток в порядке времени.
+        При равном времени раньше идут записи потока, указанного раньше в списке.
+
+        :param streams: Потоки записей (итераторы или списки), каждый упорядочен по времени.
+        :return: Ленивый итератор по записям всех потоков.
+        """
+        return heapq.merge(*streams, key=LogAnalyser.get_log_timestamp)
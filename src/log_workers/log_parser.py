@@ -1,5 +1,12 @@
+import importlib
+import io
+import os
 import re
+from collections.abc import Iterator
 
+from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.log_record import LogRecord, SymbolTable
+from src.log_workers.log_rejects import RejectCollector
 from src.table import Table
 
 
@@ -7,58 +14,137 @@ class LogParser:
     """
     Класс для парсинга логов и создания таблицы с данными из них.
     """
-    column_names = [
-        "remote_addr",
-        "remote_user",
-        "time_local",
-        "request_type",
-        "request",
-        "protocol",
-        "status",
-        "body_bytes_sent",
-        "http_referer",
-        "http_user_agent"
-    ]
+    column_names = list(LogRecord.FIELDS)
 
+    # Поля с малым числом различных значений: строки из разных записей хранятся в одном экземпляре.
+    symbol_tables = {
+        "remote_addr": SymbolTable(),
+        "remote_user": SymbolTable(),
+        "request_type": SymbolTable(),
+        "protocol": SymbolTable(),
+        "status": SymbolTable(),
+        "http_referer": SymbolTable(),
+        "http_user_agent": SymbolTable(),
+    }
+
+    # Все повторяющиеся группы посессивные: при несовпадении строки движок не перебирает
+    # варианты разбиения, поэтому время отказа линейно по длине строки.
     date_time_regex = r"\d{2}/[A-Z][a-z]{2}/\d{4}:\d{2}:\d{2}:\d{2} [\-\+]\d{4}"
+    quoted_regex = r"((?:[^\"\\]++|\\.)*+)"
     log_regex = re.compile(
         r"(\d{1,4}\.\d{1,4}\.\d{1,4}\.\d{1,4}) - "    # remote_addr
-        r"([^ ]+) "                                   # remote_user
+        r"([^ ]++) "                                  # remote_user
         r"\[(" + date_time_regex + r")] "             # time_local
-        r"\"(\w+) "                                   # request_type 
-        r"(/[^ ]*) "                                  # request
-        r"(HTTP/.+)\" "                               # protocol
-        r"(\d+) "                                     # status
-        r"(\d+) "                                     # body_bytes_sent
-        r"\"(.+)\" "                                  # http_referer 
-        r"\"(.+)\""                                   # http_user_agent
+        r"\"(\w++) "                                  # request_type
+        r"(/[^ ]*+) "                                 # request
+        r"(HTTP/[^\"]++)\" "                          # protocol
+        r"(\d++) "                                    # status
+        r"(\d++) "                                    # body_bytes_sent
+        r"\"" + quoted_regex + r"\" "                 # http_referer
+        r"\"" + quoted_regex + r"\""                  # http_user_agent
     )
 
+    url_regex = r"(?:http)s?://.*"
+
+    # Модули сжатия импортируются только при чтении сжатого файла.
+    compression_modules = {
+        ".gz": "gzip",
+        ".bz2": "bz2",
+        ".xz": "lzma",
+    }
+
     @staticmethod
-    def parse_logs(logs: list[str]) -> Table:
+    def parse_logs(logs: list[str], rejects: RejectCollector | None = None, source: str = "") -> Table:
         """
         Парсит несколько строк логов и преобразует их в таблицу.
 
         :param logs: Список строк логов для парсинга.
+        :param rejects: Учёт отброшенных строк или None, чтобы отбрасывать их молча.
+        :param source: Источник строк для учёта отброшенных строк.
         :return: Таблица с преобразованными данными.
         """
-        return Table([LogParser.parse_log(log) for log in logs if LogParser.parse_log(log) is not None])
+        return Table(LogParser.parse_lines(logs, rejects, source))
+
+    @staticmethod
+    def parse_lines(logs: list[str], rejects: RejectCollector | None = None, source: str = "") -> list[LogRecord]:
+        """
+        Парсит несколько строк логов в список записей. Строки, не соответствующие формату,
+        передаются в учёт отброшенных строк.
+
+        :param logs: Список строк логов для парсинга.
+        :param rejects: Учёт отброшенных строк или None, чтобы отбрасывать их молча.
+        :param source: Источник строк для учёта отброшенных строк.
+        :return: Список разобранных записей.
+        """
+        if rejects is None:
+            return [record for record in map(LogParser.parse_log, logs) if record is not None]
+
+        records = []
+        for log in logs:
+            record = LogParser.parse_log(log)
+            if record is not None:
+                records.append(record)
+            else:
+                rejects.add(log, source)
+        return records
 
     @staticmethod
-    def parse_log(log: str) -> dict[str, str | None] | None:
+    def parse_log(log: str) -> LogRecord | None:
         """
-        Парсит одну строку лога в словарь, в котором ключи - это имена столбцов, а значения - данные из строки лога.
+        Парсит одну строку лога в запись LogRecord, которая ведёт себя как словарь, в котором ключи - это
+        имена столбцов, а значения - данные из строки лога. Поля status и body_bytes_sent приводятся к int,
+        повторяющиеся значения остальных полей берутся из таблиц символов.
 
         :param log: Строка лога для парсинга.
-        :return: Словарь с данными или None, если лог не соответствует ожидаемому формату.
+        :return: Запись с данными или None, если лог не соответствует ожидаемому формату
+                 или содержит некорректные дату и время.
         """
-        if not LogParser.log_regex.match(log):
+        match = LogParser.log_regex.match(log)
+        if match is None:
             return None
 
-        captured_groups = LogParser.log_regex.match(log).groups()
-        parsed_log = {LogParser.column_names[i]: captured_groups[i] for i in range(0, len(captured_groups))}
+        (remote_addr, remote_user, time_local, request_type, request,
+         protocol, status, body_bytes_sent, http_referer, http_user_agent) = match.groups()
+        try:
+            # Разбор кэшируется по минутам, поэтому проверка даты почти ничего не стоит, а строки
+            # с несуществующей датой отбрасываются здесь, а не падают позже при подсчётах.
+            LogAnalyser.parse_time_local(time_local)
+        except ValueError:
+            return None
+        symbols = LogParser.symbol_tables
+
+        return LogRecord(
+            symbols["remote_addr"].intern(remote_addr),
+            symbols["remote_user"].intern(remote_user),
+            time_local,
+            symbols["request_type"].intern(request_type),
+            request,
+            symbols["protocol"].intern(protocol),
+            symbols["status"].intern(int(status)),
+            int(body_bytes_sent),
+            symbols["http_referer"].intern(http_referer),
+            symbols["http_user_agent"].intern(http_user_agent),
+        )
+
+    @staticmethod
+    def is_url(source: str) -> bool:
+        """
+        Проверяет, является ли источник логов URL.
+
+        :param source: Путь к локальному файлу или URL.
+        :return: True, если источник — URL.
+        """
+        return re.match(LogParser.url_regex, source) is not None
+
+    @staticmethod
+    def is_compressed(source: str) -> bool:
+        """
+        Проверяет, является ли источник логов сжатым файлом (по расширению).
 
-        return parsed_log
+        :param source: Путь к локальному файлу или URL.
+        :return: True, если источник — сжатый файл.
+        """
+        return os.path.splitext(source)[1] in LogParser.compression_modules
 
     @staticmethod
     def combine_logs(sources: list[str]) -> list[str]:
@@ -71,14 +157,43 @@ class LogParser:
         logs_data = []
 
         for src in sources:
-            url_regex = r"(?:http)s?://.*"
-
-            if re.match(url_regex, src):
-                import requests
-                response = requests.get(src)
-                logs_data.extend(response.text.splitlines())
-            else:
-                with open(src, 'r') as file:
-                    logs_data.extend(file.readlines())
+            logs_data.extend(LogParser.read_source(src))
 
         return logs_data
+
+    @staticmethod
+    def read_source(source: str) -> list[str]:
+        """
+        Считывает логи из одного источника (локальный файл, сжатый gzip/bz2/xz файл или URL).
+        HTTP-клиент и модули сжатия импортируются только для источников, которым они нужны.
+
+        :param source: Путь к локальному файлу или URL.
+        :return: Список строк логов.
+        """
+        return list(LogParser.iter_source(source))
+
+    @staticmethod
+    def iter_source(source: str) -> Iterator[str]:
+        """
+        Лениво считывает логи из одного источника построчно: локальные и сжатые файлы и тела HTTP-ответов
+        не загружаются в память целиком, поэтому разбор строк может идти одновременно с их чтением.
+        HTTP-клиент и модули сжатия импортируются только для источников, которым они нужны.
+
+        :param source: Путь к локальному файлу или URL.
+        :return: Итератор по строкам логов.
+        """
+        if LogParser.is_url(source):
+            from urllib.request import urlopen
+            with urlopen(source) as response:
+                charset = response.headers.get_content_charset() or "utf-8"
+                yield from io.TextIOWrapper(response, encoding=charset, errors="replace")
+            return
+
+        if LogParser.is_compressed(source):
+            codec = importlib.import_module(LogParser.compression_modules[os.path.splitext(source)[1]])
+            with codec.open(source, 'rt') as file:
+                yield from file
+            return
+
+        with open(source, 'r') as file:
+            yield from file
@@ -0,0 +1,182 @@
+import queue
+import threading
+import time
+from collections.abc import Iterator
+
+from src.log_workers.log_parser import LogParser
+from src.log_workers.log_record import LogRecord
+from src.log_workers.log_rejects import RejectCollector
+
+
+class AdaptiveBatchSize:
+    """
+    Размер пакета, подстраивающийся под измеренную скорость стадий конвейера.
+
+    После каждого пакета сообщается, сколько элементов и за какое время обработано,
+    и размер сдвигается к числу элементов, которое обрабатывается за target_seconds.
+    Так каждая передача пакета несёт примерно одинаковый объём работы, независимо от скорости источника.
+    """
+
+    def __init__(self, initial: int = 1024, minimum: int = 64, maximum: int = 65536, target_seconds: float = 0.02):
+        """
+        :param initial: Начальный размер пакета.
+        :param minimum: Минимальный размер пакета.
+        :param maximum: Максимальный размер пакета.
+        :param target_seconds: Желаемое время обработки одного пакета.
+        """
+        self.value = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+
+    def record(self, items: int, seconds: float) -> None:
+        """
+        Учитывает время обработки пакета и пересчитывает размер.
+
+        :param items: Число элементов в обработанном пакете.
+        :param seconds: Время обработки пакета.
+        """
+        if items <= 0 or seconds <= 0:
+            return
+        ideal = items / seconds * self.target_seconds
+        self.value = int(min(max((self.value + ideal) / 2, self.minimum), self.maximum))
+
+
+class _StageFailure:
+    """
+    Исключение, возникшее в потоке стадии и передаваемое по конвейеру потребителю.
+    """
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class LogPipeline:
+    """
+    Конвейер обработки логов: чтение, парсинг и накопление выполняются одновременно.
+
+    Поток чтения нарезает строки источников на пакеты, поток парсинга превращает их в записи LogRecord,
+    а вызывающий поток получает пакеты записей через batches(). Стадии связаны очередями ограниченного
+    размера: если потребитель не успевает, стадии до него блокируются, и буферизуется не больше
+    queue_size пакетов между каждой парой стадий. Размер пакетов строк подбирается по скорости более медленной
+    из стадий чтения и парсинга: каждый пакет строк передаётся вместе со временем его чтения.
+    """
+
+    _END = object()
+
+    def __init__(self, sources: list[str], rejects: RejectCollector | None = None, queue_size: int = 4,
+                 batch_size: AdaptiveBatchSize | None = None):
+        """
+        :param sources: Пути к локальным файлам или URL.
+        :param rejects: Учёт отброшенных строк или None, чтобы отбрасывать их молча.
+        :param queue_size: Максимальное число пакетов в каждой очереди между стадиями.
+        :param batch_size: Размер пакетов строк или None для размера по умолчанию.
+        """
+        self.sources = sources
+        self.rejects = rejects
+        self.queue_size = queue_size
+        self.batch_size = batch_size or AdaptiveBatchSize()
+
+    def batches(self) -> Iterator[tuple[str, list[LogRecord]]]:
+        """
+        Запускает стадии чтения и парсинга и выдаёт пакеты разобранных записей по мере готовности.
+        Записи каждого источника выдаются в порядке строк в источнике.
+
+        :raises Exception: Ошибка любой стадии (например, FileNotFoundError) пробрасывается потребителю.
+        :return: Итератор по парам (источник, пакет записей).
+        """
+        lines_queue = queue.Queue(self.queue_size)
+        records_queue = queue.Queue(self.queue_size)
+        stop_event = threading.Event()
+
+        threads = [
+            threading.Thread(target=self._read, args=(lines_queue, stop_event), daemon=True),
+            threading.Thread(target=self._parse, args=(lines_queue, records_queue, stop_event), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = records_queue.get()
+                if item is LogPipeline._END:
+                    break
+                if isinstance(item, _StageFailure):
+                    raise item.error
+                yield item
+        finally:
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
+    def _read(self, lines_queue: queue.Queue, stop_event: threading.Event) -> None:
+        try:
+            started = time.perf_counter()
+            for source in self.sources:
+                batch = []
+                for line in LogParser.iter_source(source):
+                    batch.append(line)
+                    if len(batch) >= self.batch_size.value:
+                        if not self._put(lines_queue, (source, batch, time.perf_counter() - started), stop_event):
+                            return
+                        started = time.perf_counter()
+                        batch = []
+                if batch:
+                    if not self._put(lines_queue, (source, batch, time.perf_counter() - started), stop_event):
+                        return
+                    started = time.perf_counter()
+            self._put(lines_queue, LogPipeline._END, stop_event)
+        except Exception as error:
+            self._put(lines_queue, _StageFailure(error), stop_event)
+
+    def _parse(self, lines_queue: queue.Queue, records_queue: queue.Queue, stop_event: threading.Event) -> None:
+        try:
+            while True:
+                item = self._get(lines_queue, stop_event)
+                if item is None:
+                    return
+                if item is LogPipeline._END or isinstance(item, _StageFailure):
+                    self._put(records_queue, item, stop_event)
+                    return
+
+                source, lines, read_seconds = item
+                started = time.perf_counter()
+                records = LogParser.parse_lines(lines, self.rejects, source)
+                for record in records:
+                    record.source = source
+                # Стадии работают одновременно, поэтому пропускную способность конвейера задаёт более медленная.
+                self.batch_size.record(len(lines), max(read_seconds, time.perf_counter() - started))
+
+                if records and not self._put(records_queue, (source, records), stop_event):
+                    return
+        except Exception as error:
+            self._put(records_queue, _StageFailure(error), stop_event)
+
+    @staticmethod
+    def _put(target: queue.Queue, item, stop_event: threading.Event) -> bool:
+        """
+        Кладёт элемент в очередь, ожидая места, пока конвейер не остановлен.
+
+        :return: True, если элемент положен, False, если конвейер остановлен.
+        """
+        while not stop_event.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source: queue.Queue, stop_event: threading.Event):
+        """
+        Берёт элемент из очереди, ожидая его появления, пока конвейер не остановлен.
+
+        :return: Элемент или None, если конвейер остановлен.
+        """
+        while not stop_event.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
@@ -0,0 +1,93 @@
+from collections.abc import Iterator, Mapping
+
+
+class SymbolTable:
+    """
+    Таблица символов для одного поля логов: хранит единственный экземпляр каждого встреченного значения,
+    чтобы одинаковые строки из разных записей ссылались на один объект в памяти.
+    """
+
+    def __init__(self, max_size: int = 65536):
+        """
+        Инициализирует пустую таблицу символов.
+
+        :param max_size: Максимальное число хранимых значений. После заполнения новые значения
+                         возвращаются как есть, чтобы поле с высокой кардинальностью не раздувало таблицу.
+        """
+        self._symbols = {}
+        self.max_size = max_size
+
+    def intern(self, value):
+        """
+        Возвращает канонический экземпляр значения.
+
+        :param value: Значение поля (строка или число).
+        :return: Ранее сохранённый равный объект или само значение.
+        """
+        symbol = self._symbols.get(value)
+        if symbol is not None:
+            return symbol
+        if len(self._symbols) < self.max_size:
+            self._symbols[value] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+
+class LogRecord(Mapping):
+    """
+    Компактная запись одной строки лога. Поля хранятся в __slots__, поэтому запись не содержит
+    собственного словаря, а status и body_bytes_sent хранятся как числа.
+
+    Запись ведёт себя как неизменяемый словарь столбцов, поэтому её можно класть в Table наравне с dict.
+    Если записи назначен источник (source), он тоже становится столбцом.
+    """
+
+    FIELDS = (
+        "remote_addr",
+        "remote_user",
+        "time_local",
+        "request_type",
+        "request",
+        "protocol",
+        "status",
+        "body_bytes_sent",
+        "http_referer",
+        "http_user_agent"
+    )
+    SOURCE_FIELDS = FIELDS + ("source",)
+    __slots__ = SOURCE_FIELDS
+
+    def __init__(self, remote_addr: str, remote_user: str, time_local: str, request_type: str, request: str,
+                 protocol: str, status: int, body_bytes_sent: int, http_referer: str, http_user_agent: str,
+                 source: str | None = None):
+        self.remote_addr = remote_addr
+        self.remote_user = remote_user
+        self.time_local = time_local
+        self.request_type = request_type
+        self.request = request
+        self.protocol = protocol
+        self.status = status
+        self.body_bytes_sent = body_bytes_sent
+        self.http_referer = http_referer
+        self.http_user_agent = http_user_agent
+        self.source = source
+
+    def __getitem__(self, column: str):
+        if column not in self._columns():
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns())
+
+    def __len__(self) -> int:
+        return len(self._columns())
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{column}={getattr(self, column)!r}" for column in self._columns())
+        return f"LogRecord({values})"
+
+    def _columns(self) -> tuple[str, ...]:
+        return LogRecord.FIELDS if self.source is None else LogRecord.SOURCE_FIELDS
@@ -0,0 +1,158 @@
+import threading
+from collections import Counter
+from datetime import datetime
+
+
+class RejectCollector:
+    """
+    Класс для учёта строк логов, которые не удалось разобрать.
+
+    Каждая отброшенная строка классифицируется дешёвыми проверками (без регулярных выражений),
+    число отброшенных строк считается по источникам и причинам, а первые строки каждой причины
+    при необходимости записываются в файл образцов. Строки можно добавлять из нескольких потоков
+    (например, из конвейеров разных источников).
+    """
+
+    EMPTY = "empty"
+    IPV6 = "ipv6"
+    TRUNCATED = "truncated"
+    UNKNOWN_METHOD = "unknown_method"
+    INVALID_TIME = "invalid_time"
+    MALFORMED = "malformed"
+
+    KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "DELETE", "CONNECT", "OPTIONS", "TRACE", "PATCH"})
+
+    # В строке combined-формата три поля в кавычках: запрос, referer и user agent.
+    QUOTES_IN_LINE = 6
+
+    # Длина поля time_local: 08/Nov/2024:10:52:20 +0000.
+    TIME_LENGTH = 26
+
+    def __init__(self, reject_file: str | None = None, max_samples: int = 100):
+        """
+        Инициализирует пустой учёт отброшенных строк.
+
+        :param reject_file: Путь к файлу для образцов отброшенных строк или None, чтобы не писать образцы.
+        :param max_samples: Максимальное число образцов для каждой причины.
+        """
+        self.reject_file = reject_file
+        self.max_samples = max_samples
+        self.counts = {}
+        self._samples = Counter()
+        self._file = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def classify(line: str) -> str:
+        """
+        Определяет причину, по которой строка не соответствует формату логов.
+
+        :param line: Отброшенная строка лога.
+        :return: Причина: empty, ipv6, truncated, unknown_method, invalid_time или malformed.
+        """
+        line = line.rstrip()
+        if not line:
+            return RejectCollector.EMPTY
+
+        first_space = line.find(" ")
+        if ":" in (line[:first_space] if first_space != -1 else line):
+            return RejectCollector.IPV6
+
+        if line.count('"') < RejectCollector.QUOTES_IN_LINE or not line.endswith('"'):
+            # Обрезанной считается только строка, которая начинается как запись лога; остальное — мусор.
+            if RejectCollector.starts_like_record(line, first_space):
+                return RejectCollector.TRUNCATED
+            return RejectCollector.MALFORMED
+
+        method_start = line.find('"') + 1
+        method_end = line.find(" ", method_start)
+        if line[method_start:method_end] not in RejectCollector.KNOWN_METHODS:
+            return RejectCollector.UNKNOWN_METHOD
+
+        # Время нужной длины, но с несуществующими значениями (например, месяц Foo или час 25).
+        time_start = line.find("[") + 1
+        time_end = line.find("]", time_start)
+        if time_start and time_end - time_start == RejectCollector.TIME_LENGTH:
+            try:
+                datetime.strptime(line[time_start:time_end], "%d/%b/%Y:%H:%M:%S %z")
+            except ValueError:
+                return RejectCollector.INVALID_TIME
+
+        return RejectCollector.MALFORMED
+
+    @staticmethod
+    def starts_like_record(line: str, first_space: int) -> bool:
+        """
+        Проверяет, что строка начинается как запись лога: IPv4-адрес, затем "- " и "[".
+
+        :param line: Отброшенная строка лога.
+        :param first_space: Позиция первого пробела в строке.
+        :return: True, если начало строки похоже на запись лога.
+        """
+        if first_space == -1:
+            return False
+        octets = line[:first_space].split(".")
+        if len(octets) != 4 or not all(octet.isdigit() and len(octet) <= 3 for octet in octets):
+            return False
+        return line.startswith("- ", first_space + 1) and line.find("[", first_space) != -1
+
+    def add(self, line: str, source: str = "") -> str:
+        """
+        Учитывает отброшенную строку.
+
+        :param line: Отброшенная строка лога.
+        :param source: Источник, из которого прочитана строка.
+        :return: Причина, по которой строка отброшена.
+        """
+        reason = RejectCollector.classify(line)
+
+        with self._lock:
+            source_counts = self.counts.get(source)
+            if source_counts is None:
+                source_counts = self.counts[source] = Counter()
+            source_counts[reason] += 1
+
+            if self.reject_file is not None and self._samples[reason] < self.max_samples:
+                self._samples[reason] += 1
+                if self._file is None:
+                    self._file = open(self.reject_file, "a", encoding="utf-8")
+                self._file.write(f"{source}\t{reason}\t{line.rstrip()}\n")
+
+        return reason
+
+    def add_count(self, source: str, reason: str, count: int) -> None:
+        """
+        Учитывает уже подсчитанные отброшенные строки (например, сохранённые вместе со свёртками) без образцов.
+
+        :param source: Источник строк.
+        :param reason: Причина, по которой строки отброшены.
+        :param count: Число строк.
+        """
+        with self._lock:
+            self.counts.setdefault(source, Counter())[reason] += count
+
+    def merge(self, other: "RejectCollector") -> None:
+        """
+        Добавляет к учёту числа отброшенных строк из другого учёта.
+
+        :param other: Другой учёт отброшенных строк.
+        """
+        for source, source_counts in other.counts.items():
+            self.counts.setdefault(source, Counter()).update(source_counts)
+
+    @property
+    def total(self) -> int:
+        """
+        Возвращает общее число отброшенных строк.
+
+        :return: Число строк.
+        """
+        return sum(sum(source_counts.values()) for source_counts in self.counts.values())
+
+    def close(self) -> None:
+        """
+        Закрывает файл образцов, если он был открыт.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,116 @@
+import json
+from functools import lru_cache
+
+
+class ResourceNormalizer:
+    """
+    Приводит пути ресурсов к каноническому виду, чтобы запросы к одному маршруту считались вместе.
+
+    Нормализация пути:
+    - отбрасываются строка запроса (?...) и фрагмент (#...);
+    - числовые сегменты заменяются на {id}, UUID — на {uuid};
+    - путь, подходящий под шаблон пользователя (например, /downloads/* или /users/{id}/posts), заменяется шаблоном,
+      где * совпадает с любым одним сегментом;
+    - при заданной глубине маршрута путь обрезается до первых route_depth сегментов.
+
+    Результаты кэшируются в LRU-кэше экземпляра по исходному пути, поэтому повторный путь стоит одного поиска в словаре.
+    """
+
+    ID = "{id}"
+    UUID = "{uuid}"
+    WILDCARD = "*"
+
+    # Позиции дефисов в UUID вида 123e4567-e89b-12d3-a456-426614174000.
+    UUID_DASHES = (8, 13, 18, 23)
+    UUID_LENGTH = 36
+    HEX_DIGITS = frozenset("0123456789abcdefABCDEF-")
+
+    def __init__(self, templates: list[str] | None = None, route_depth: int | None = None, cache_size: int = 65536):
+        """
+        :param templates: Шаблоны маршрутов; проверяются по порядку, первый подошедший заменяет путь.
+        :param route_depth: Число первых сегментов пути, по которым группируются маршруты, или None.
+        :param cache_size: Максимальное число путей в кэше.
+        :raises ValueError: Если route_depth меньше 1.
+        """
+        if route_depth is not None and route_depth < 1:
+            raise ValueError("Route depth must be positive")
+        self.templates = [(template, template.strip("/").split("/")) for template in templates or []]
+        self.route_depth = route_depth
+        # Кэш принадлежит экземпляру: у нормализаторов с разными шаблонами разные результаты.
+        self.normalize = lru_cache(maxsize=cache_size)(self.normalize)
+
+    @property
+    def config(self) -> str:
+        """
+        Возвращает описание настроек нормализатора: нормализаторы с равными описаниями дают одинаковые пути.
+
+        :return: Строка с шаблонами и глубиной маршрута.
+        """
+        return json.dumps({"templates": [template for template, _ in self.templates], "route_depth": self.route_depth})
+
+    def normalize(self, resource: str) -> str:
+        """
+        Возвращает канонический вид пути ресурса.
+
+        :param resource: Путь из поля request, например /downloads/product_1?x=1.
+        :return: Канонический путь, например /downloads/product_1.
+        """
+        end = len(resource)
+        for separator in "?#":
+            position = resource.find(separator, 0, end)
+            if position != -1:
+                end = position
+        path = resource[:end]
+
+        segments = [ResourceNormalizer.normalize_segment(segment) for segment in path.strip("/").split("/")]
+        for template, template_segments in self.templates:
+            if ResourceNormalizer.matches(segments, template_segments):
+                return template
+
+        if self.route_depth is not None:
+            segments = segments[:self.route_depth]
+        return "/" + "/".join(segments)
+
+    @staticmethod
+    def normalize_segment(segment: str) -> str:
+        """
+        Заменяет числовой сегмент на {id}, а UUID — на {uuid}.
+
+        :param segment: Сегмент пути.
+        :return: Сегмент или его замена.
+        """
+        if segment.isdigit():
+            return ResourceNormalizer.ID
+        if ResourceNormalizer.is_uuid(segment):
+            return ResourceNormalizer.UUID
+        return segment
+
+    @staticmethod
+    def is_uuid(segment: str) -> bool:
+        """
+        Проверяет, является ли сегмент UUID в канонической записи (8-4-4-4-12 шестнадцатеричных цифр).
+
+        :param segment: Сегмент пути.
+        :return: True, если сегмент — UUID.
+        """
+        return (
+            len(segment) == ResourceNormalizer.UUID_LENGTH
+            and all(segment[position] == "-" for position in ResourceNormalizer.UUID_DASHES)
+            and segment.count("-") == len(ResourceNormalizer.UUID_DASHES)
+            and ResourceNormalizer.HEX_DIGITS.issuperset(segment)
+        )
+
+    @staticmethod
+    def matches(segments: list[str], template_segments: list[str]) -> bool:
+        """
+        Проверяет, подходит ли путь под шаблон: число сегментов совпадает, а каждый сегмент шаблона
+        равен сегменту пути или является *.
+
+        :param segments: Нормализованные сегменты пути.
+        :param template_segments: Сегменты шаблона.
+        :return: True, если путь подходит под шаблон.
+        """
+        return len(segments) == len(template_segments) and all(
+            expected == ResourceNormalizer.WILDCARD or expected == segment
+            for segment, expected in zip(segments, template_segments)
+        )
@@ -0,0 +1,260 @@
+import os
+import re
+import sqlite3
+from collections import Counter
+from datetime import date
+
+from src.log_workers.log_aggregator import DayAggregates, LogAggregator
+from src.log_workers.log_merger import LogMerger
+from src.log_workers.log_parser import LogParser
+from src.log_workers.log_rejects import RejectCollector
+from src.log_workers.resource_normalizer import ResourceNormalizer
+
+
+class RollupStore:
+    """
+    Хранилище свёрток (предвычисленных агрегатов) логов в файле SQLite.
+
+    Каждый закрытый файл логов (ротированный или сжатый, больше не дописываемый) читается один раз:
+    по нему считаются подневные свёртки (запросы, байты, статусы, пользователи и ресурсы), которые сохраняются
+    вместе с размером и временем изменения файла.
+    Отчёты за прошлые периоды затем собираются из свёрток, а сырые строки читаются только из открытых файлов.
+
+    Для пользователей и ресурсов хранится не больше max_keys самых частых значений за день,
+    поэтому их топы за период точны, пока искомые значения входят в дневные топы. Если ресурсы группируются
+    нормализатором, они нормализуются до подсчёта, а свёртки хранятся отдельно для каждой настройки нормализатора.
+    Вместе со свёртками сохраняется число отброшенных строк файла по причинам.
+    """
+
+    DAY = "day"
+
+    REQUESTS = "requests"
+    BYTES = "bytes"
+    STATUS = "status"
+    USER = "user"
+    RESOURCE = "resource"
+
+    # Ротированные NGINX файлы: access.log.1, access.log.2 и т.д.
+    ROTATED_SUFFIX = re.compile(r"\.\d+$")
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS closed_sources (
+            source TEXT NOT NULL,
+            normalizer TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            PRIMARY KEY (source, normalizer)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS rollups (
+            source TEXT NOT NULL,
+            normalizer TEXT NOT NULL,
+            granularity TEXT NOT NULL,
+            period TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value INTEGER NOT NULL,
+            PRIMARY KEY (normalizer, granularity, period, metric, key, source)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS rejects (
+            source TEXT NOT NULL,
+            reason TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (source, reason)
+        )
+        """,
+    )
+
+    def __init__(self, path: str, max_keys: int = 1000):
+        """
+        Открывает (или создаёт) хранилище свёрток.
+
+        :param path: Путь к файлу SQLite.
+        :param max_keys: Максимальное число пользователей и ресурсов каждого типа запроса, хранимых за день.
+        """
+        self.path = path
+        self.max_keys = max_keys
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            for statement in RollupStore.SCHEMA:
+                self._connection.execute(statement)
+
+    @staticmethod
+    def is_closed_source(source: str) -> bool:
+        """
+        Проверяет, закрыт ли файл логов: ротированные (access.log.1) и сжатые файлы больше не дописываются.
+
+        :param source: Путь к файлу или URL.
+        :return: True, если источник — закрытый локальный файл.
+        """
+        if LogParser.is_url(source):
+            return False
+        return LogParser.is_compressed(source) or RollupStore.ROTATED_SUFFIX.search(source) is not None
+
+    @staticmethod
+    def get_normalizer_key(normalizer: ResourceNormalizer | None) -> str:
+        """
+        Возвращает ключ, под которым хранятся свёртки, посчитанные с нормализатором.
+
+        :param normalizer: Нормализатор путей ресурсов или None.
+        :return: Описание настроек нормализатора или пустая строка для ресурсов без нормализации.
+        """
+        return "" if normalizer is None else normalizer.config
+
+    def is_stored(self, source: str, normalizer: ResourceNormalizer | None = None) -> bool:
+        """
+        Проверяет, есть ли в хранилище свёртки файла в его текущем состоянии (по размеру и времени изменения),
+        посчитанные с тем же нормализатором.
+
+        :param source: Путь к файлу.
+        :param normalizer: Нормализатор путей ресурсов или None.
+        :return: True, если свёртки файла актуальны.
+        """
+        stat = os.stat(source)
+        row = self._connection.execute(
+            "SELECT size, mtime FROM closed_sources WHERE source = ? AND normalizer = ?",
+            (source, RollupStore.get_normalizer_key(normalizer))
+        ).fetchone()
+        return row is not None and row == (stat.st_size, stat.st_mtime)
+
+    def add_closed_source(self, source: str, rejects: RejectCollector | None = None,
+                          normalizer: ResourceNormalizer | None = None) -> bool:
+        """
+        Считает и сохраняет свёртки закрытого файла, если их ещё нет или файл изменился.
+        Свёртки изменившегося файла заменяются целиком. Число отброшенных строк файла сохраняется вместе
+        со свёртками, поэтому оно попадает в rejects и тогда, когда файл не читается.
+
+        :param source: Путь к файлу.
+        :param rejects: Учёт отброшенных строк или None, чтобы отбрасывать их молча.
+        :param normalizer: Нормализатор, которым ресурсы нормализуются до подсчёта, или None.
+        :raises FileNotFoundError: Если файл не найден.
+        :return: True, если файл прочитан, False, если свёртки уже были актуальны.
+        """
+        if self.is_stored(source, normalizer):
+            if rejects is not None:
+                for reason, count in self._connection.execute(
+                        "SELECT reason, count FROM rejects WHERE source = ?", (source,)
+                ):
+                    rejects.add_count(source, reason, count)
+            return False
+
+        stat = os.stat(source)
+        source_rejects = rejects if rejects is not None else RejectCollector()
+        days = LogAggregator(normalizer)
+        for record in LogMerger.read_records(source, source_rejects):
+            days.add_row(record)
+
+        normalizer_key = RollupStore.get_normalizer_key(normalizer)
+        rows = []
+        for day in days.get_days():
+            rows.extend(self._rollup_rows(source, normalizer_key, RollupStore.DAY, day.isoformat(),
+                                          days.get_day_aggregates(day)))
+
+        with self._connection:
+            self._connection.execute("DELETE FROM rollups WHERE source = ? AND normalizer = ?",
+                                     (source, normalizer_key))
+            self._connection.executemany("INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO closed_sources VALUES (?, ?, ?, ?)",
+                (source, normalizer_key, stat.st_size, stat.st_mtime)
+            )
+            self._connection.execute("DELETE FROM rejects WHERE source = ?", (source,))
+            self._connection.executemany(
+                "INSERT INTO rejects VALUES (?, ?, ?)",
+                ((source, reason, count) for reason, count in source_rejects.counts.get(source, {}).items())
+            )
+        return True
+
+    def _rollup_rows(self, source: str, normalizer_key: str, granularity: str, period: str,
+                     aggregates: DayAggregates) -> list[tuple]:
+        """
+        Преобразует агрегаты периода в строки таблицы rollups.
+
+        :return: Список строк (source, normalizer, granularity, period, metric, key, value).
+        """
+        prefix = (source, normalizer_key, granularity, period)
+        rows = [
+            (*prefix, RollupStore.REQUESTS, "", aggregates.requests),
+            (*prefix, RollupStore.BYTES, "", aggregates.bytes_sent),
+        ]
+        rows.extend(
+            (*prefix, RollupStore.STATUS, str(status), count)
+            for status, count in aggregates.statuses.items()
+        )
+        rows.extend(
+            (*prefix, RollupStore.USER, user, count)
+            for user, count in aggregates.users.most_common(self.max_keys)
+        )
+        for request_type, resources in aggregates.resources.items():
+            rows.extend(
+                (*prefix, RollupStore.RESOURCE, f"{request_type} {resource}", count)
+                for resource, count in resources.most_common(self.max_keys)
+            )
+        return rows
+
+    def load_days(self, aggregator: LogAggregator, start_date: date | None = None,
+                  finish_date: date | None = None, sources: list[str] | None = None) -> int:
+        """
+        Добавляет в агрегатор подневные свёртки закрытых файлов между двумя датами включительно.
+        Загружаются свёртки, посчитанные с нормализатором агрегатора.
+
+        :param aggregator: Агрегатор, в который добавляются свёртки.
+        :param start_date: Начальная дата или None.
+        :param finish_date: Конечная дата или None.
+        :param sources: Файлы, свёртки которых нужно загрузить, или None для всех файлов хранилища.
+        :return: Число загруженных дней.
+        """
+        days = {}
+        for period, metric, key, value in self._select(RollupStore.DAY, start_date, finish_date, sources,
+                                                       aggregator.normalizer):
+            aggregates = days.get(period)
+            if aggregates is None:
+                aggregates = days[period] = DayAggregates()
+
+            if metric == RollupStore.REQUESTS:
+                aggregates.requests += value
+            elif metric == RollupStore.BYTES:
+                aggregates.bytes_sent += value
+            elif metric == RollupStore.STATUS:
+                aggregates.statuses[int(key)] += value
+            elif metric == RollupStore.USER:
+                aggregates.users[key] += value
+            elif metric == RollupStore.RESOURCE:
+                request_type, resource = key.split(" ", 1)
+                aggregates.resources.setdefault(request_type, Counter())[resource] += value
+
+        for period, aggregates in days.items():
+            aggregator.add_day_aggregates(date.fromisoformat(period), aggregates)
+        return len(days)
+
+    def _select(self, granularity: str, start_date: date | None, finish_date: date | None,
+                sources: list[str] | None = None, normalizer: ResourceNormalizer | None = None) -> list[tuple]:
+        """
+        Выбирает свёртки, сложенные по всем файлам, за период.
+
+        :return: Список строк (period, metric, key, value).
+        """
+        # Периоды хранятся в ISO8601, поэтому их строковый порядок совпадает с хронологическим.
+        query = "SELECT period, metric, key, SUM(value) FROM rollups WHERE normalizer = ? AND granularity = ?"
+        params = [RollupStore.get_normalizer_key(normalizer), granularity]
+        if start_date is not None:
+            query += " AND period >= ?"
+            params.append(start_date.isoformat())
+        if finish_date is not None:
+            query += " AND period <= ?"
+            params.append(finish_date.isoformat())
+        if sources is not None:
+            query += f" AND source IN ({', '.join('?' * len(sources))})"
+            params.extend(sources)
+        query += " GROUP BY period, metric, key ORDER BY period"
+        return self._connection.execute(query, params).fetchall()
+
+    def close(self) -> None:
+        """
+        Закрывает соединение с базой.
+        """
+        self._connection.close()
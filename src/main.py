@@ -1,12 +1,11 @@
+import importlib.util
 import logging
 import sys
 from datetime import datetime
 from argparse import ArgumentParser
-from src.log_workers.log_analyser import LogAnalyser
-from src.log_workers.log_parser import LogParser
-from src.stats_printer.stats_printer import StatsPrinter
-from src.table_printers.adoc_table_printer import AdocTablePrinter
-from src.table_printers.markdown_table_printer import MarkdownTablePrinter
+
+# Парсер, анализатор, принтеры и backends импортируются внутри функций режима запуска,
+# чтобы каждый запуск загружал только нужные ему модули.
 
 logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger(__name__)
@@ -15,39 +14,150 @@ sources = []
 from_date = None
 to_date = None
 
-table_printer = MarkdownTablePrinter()  
+table_printer = None
 max_lines_in_table = 5
+backend = "python"
+server_address = None
+poll_interval = 5.0
+rejects_file = None
+ip_rate_limit = 600
+rollup_db = None
+normalize_resources = False
+resource_templates = []
+route_depth = None
 
 
 def main(params):
-    global table_printer, from_date, to_date, max_lines_in_table
+    global table_printer, from_date, to_date, max_lines_in_table, backend
 
     parse_params(params)
-    
-    non_parsed_logs = LogParser().combine_logs(sources)
-    if not non_parsed_logs:
+
+    if server_address is not None:
+        run_server()
+    else:
+        run_report()
+
+
+def run_server():
+    from src.server.analysis_server import AnalysisServer
+
+    AnalysisServer(
+        sources, *server_address, poll_interval=poll_interval, normalizer=create_normalizer(),
+        rejects_file=rejects_file
+    ).serve_forever()
+
+
+def create_normalizer():
+    """
+    Создаёт нормализатор путей ресурсов, если он включён параметрами.
+
+    :return: ResourceNormalizer или None.
+    """
+    if not (normalize_resources or resource_templates or route_depth):
+        return None
+
+    from src.log_workers.resource_normalizer import ResourceNormalizer
+    return ResourceNormalizer(resource_templates, route_depth)
+
+
+def run_report():
+    from src.log_workers.anomaly_detectors import ErrorRateDetector, IpRateDetector, ResourceDominanceDetector
+    from src.log_workers.log_aggregator import LogAggregator
+    from src.log_workers.log_analyser import LogAnalyser
+    from src.log_workers.log_merger import LogMerger
+    from src.log_workers.log_rejects import RejectCollector
+    from src.stats_printer.stats_printer import StatsPrinter
+
+    rejects = RejectCollector(rejects_file)
+    normalizer = create_normalizer()
+    breakdown_sources = sources if len(sources) > 1 else None
+    raw_sources = sources
+    aggregator = None
+    source_aggregators = {}
+    if rollup_db is not None:
+        # Закрытые файлы отвечают из свёрток (и читаются только при первом появлении), сырыми читаются открытые.
+        from src.log_workers.rollup_store import RollupStore
+
+        store = RollupStore(rollup_db)
+        closed_sources = [source for source in sources if RollupStore.is_closed_source(source)]
+        raw_sources = [source for source in sources if source not in closed_sources]
+        for source in closed_sources:
+            if store.add_closed_source(source, rejects, normalizer):
+                LOGGER.info("Rollups stored for %s", source)
+        aggregator = LogAggregator(normalizer)
+        store.load_days(aggregator, from_date, to_date, closed_sources)
+        if breakdown_sources:
+            for source in closed_sources:
+                source_aggregators[source] = LogAggregator(normalizer)
+                store.load_days(source_aggregators[source], from_date, to_date, [source])
+        store.close()
+    elif backend != "numpy":
+        aggregator = LogAggregator(normalizer)
+    if aggregator is not None and breakdown_sources:
+        for source in raw_sources:
+            source_aggregators[source] = LogAggregator(normalizer)
+
+    # Записи источников сливаются по времени по мере чтения (у каждого источника свой конвейер чтения и парсинга)
+    # и сразу накапливаются в агрегатах и детекторах, поэтому сами записи в памяти не хранятся.
+    detectors = [
+        IpRateDetector(max_requests=ip_rate_limit), ErrorRateDetector(), ResourceDominanceDetector(normalizer=normalizer)
+    ]
+    is_between = LogAnalyser.get_date_predicate(from_date, to_date)
+    columnar_builder = None
+    if aggregator is None:
+        from src.log_workers.columnar_logs import ColumnarLogsBuilder
+        columnar_builder = ColumnarLogsBuilder()
+    records = 0
+    for record in LogMerger.merge(raw_sources, rejects):
+        records += 1
+        if aggregator is not None:
+            aggregator.add_row(record)
+            if source_aggregators:
+                source_aggregators[record.source].add_row(record)
+        if is_between(record):
+            LogAnalyser.observe_anomalies(record, detectors)
+            if columnar_builder is not None:
+                columnar_builder.add(record)
+    rejects.close()
+    anomalies = LogAnalyser.collect_anomalies(detectors)
+
+    # Агрегатор и свёртки уже хранят канонические пути, а колоночные логи — исходные.
+    stats_printer = StatsPrinter(table_printer, breakdown_sources, normalizer if aggregator is None else None)
+
+    if not records and (aggregator is None or not aggregator.get_days()):
         LOGGER.info("No logs passed to program")
+        if rejects.total:
+            stats_printer.print_rejects(rejects)
         return
 
-    logs = LogParser().parse_logs(non_parsed_logs)
-    logs = LogAnalyser().get_date_constrained_logs(logs, from_date, to_date)
+    if aggregator is not None:
+        logs = aggregator.between_days(from_date, to_date, source_aggregators or None)
+    else:
+        logs = columnar_builder.build()
 
-    stats_printer = StatsPrinter(table_printer)
-    
     stats_printer.print_overall_info(logs, sources, from_date, to_date)
     LOGGER.info("")
 
+    if rejects.total:
+        stats_printer.print_rejects(rejects)
+        LOGGER.info("")
+
     stats_printer.print_most_popular_statuses(logs, max_lines_in_table)
     LOGGER.info("")
     stats_printer.print_most_high_loaded_days(logs, max_lines_in_table)
     LOGGER.info("")
     stats_printer.print_most_active_users(logs, max_lines_in_table)
     LOGGER.info("")
-    stats_printer.print_most_popular_statuses(logs, max_lines_in_table)
+    stats_printer.print_most_popular_resources(logs, max_lines_in_table)
+
+    if anomalies:
+        LOGGER.info("")
+        stats_printer.print_anomalies(anomalies, max_lines_in_table)
 
 
 def parse_params(params):
-    global sources, from_date, to_date, table_printer, max_lines_in_table
+    global sources, from_date, to_date, table_printer, max_lines_in_table, backend, server_address, poll_interval, \
+        rejects_file, ip_rate_limit, rollup_db, normalize_resources, resource_templates, route_depth
     
     parser = ArgumentParser(description="Log analysis tool")
     parser.add_argument("--sources", nargs='+', help="Paths to log files")
@@ -55,6 +165,19 @@ def parse_params(params):
     parser.add_argument("--to", dest="to_date", type=str, help="End date (ISO8601)")
     parser.add_argument("--format", choices=["markdown", "adoc"], help="Output format (markdown or adoc)")
     parser.add_argument("--lines", type=int, help="Maximum lines in output tables")
+    parser.add_argument("--backend", choices=["python", "numpy"], help="Analytics backend (python or numpy)")
+    parser.add_argument("--normalize-resources", action="store_true",
+                        help="Group resources without query strings and with numeric and UUID segments collapsed")
+    parser.add_argument("--resource-template", nargs="+",
+                        help="Route templates resources are grouped by, '*' matches one path segment")
+    parser.add_argument("--route-depth", type=int, help="Group resources by this many leading path segments")
+    parser.add_argument("--serve", action="store_true", help="Run as a daemon answering reports over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1", help="Server host (with --serve)")
+    parser.add_argument("--port", type=int, default=8080, help="Server port (with --serve)")
+    parser.add_argument("--rejects-file", help="File to append samples of lines that could not be parsed")
+    parser.add_argument("--ip-rate-limit", type=int, help="Requests per minute from one IP reported as an anomaly")
+    parser.add_argument("--rollup-db", help="SQLite file with rollups of closed (rotated or compressed) log files")
+    parser.add_argument("--poll-interval", type=float, help="Seconds between reads of new log lines (with --serve)")
 
     args = parser.parse_args(params)
     
@@ -68,13 +191,46 @@ def parse_params(params):
         to_date = datetime.fromisoformat(args.to_date).date()
 
     if args.format == "adoc":
+        from src.table_printers.adoc_table_printer import AdocTablePrinter
         table_printer = AdocTablePrinter()
     else:
+        from src.table_printers.markdown_table_printer import MarkdownTablePrinter
         table_printer = MarkdownTablePrinter()
     
     if args.lines:
         max_lines_in_table = args.lines
 
+    if args.backend:
+        backend = args.backend
+        if backend == "numpy" and args.rollup_db:
+            parser.error("--rollup-db cannot be combined with --backend numpy")
+        if backend == "numpy" and importlib.util.find_spec("numpy") is None:
+            parser.error("--backend numpy requires NumPy to be installed")
+
+    if args.normalize_resources:
+        normalize_resources = True
+
+    if args.resource_template:
+        resource_templates = args.resource_template
+
+    if args.route_depth:
+        route_depth = args.route_depth
+
+    if args.serve:
+        server_address = (args.host, args.port)
+
+    if args.poll_interval:
+        poll_interval = args.poll_interval
+
+    if args.rejects_file:
+        rejects_file = args.rejects_file
+
+    if args.ip_rate_limit:
+        ip_rate_limit = args.ip_rate_limit
+
+    if args.rollup_db:
+        rollup_db = args.rollup_db
+
 
 if __name__ == "__main__":
     """
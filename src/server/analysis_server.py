@@ -0,0 +1,242 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.log_workers.log_aggregator import LogAggregator
+from src.log_workers.log_parser import LogParser
+from src.log_workers.log_rejects import RejectCollector
+from src.log_workers.resource_normalizer import ResourceNormalizer
+from src.server.source_follower import SourceFollower
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AnalysisServer:
+    """
+    Долгоживущий сервер анализа логов.
+
+    Держит в памяти подневные агрегаты (LogAggregator), периодически дочитывает новые строки
+    из источников и отвечает на запросы отчётов по HTTP в формате JSON. Последние ответы кэшируются
+    с учётом версии агрегатов, поэтому после поступления новых данных они пересчитываются.
+
+    Эндпоинты (параметры from, to в формате ISO8601 и lines необязательны):
+    /overall, /statuses, /users, /days, /resources, /rejects.
+    """
+
+    DEFAULT_LINES = 5
+    CACHE_SIZE = 256
+
+    def __init__(self, sources: list[str], host: str = "127.0.0.1", port: int = 8080, poll_interval: float = 5.0,
+                 normalizer: ResourceNormalizer | None = None, rejects_file: str | None = None):
+        """
+        Инициализирует сервер. Сокет открывается сразу, поэтому при port=0 реальный порт доступен в address.
+
+        :param sources: Пути к локальным файлам или URL с логами.
+        :param host: Адрес, на котором слушает сервер.
+        :param port: Порт сервера (0 — выбрать свободный).
+        :param poll_interval: Период в секундах, с которым дочитываются новые строки.
+        :param normalizer: Нормализатор путей ресурсов или None, чтобы считать ресурсы как есть.
+        :param rejects_file: Путь к файлу для образцов отброшенных строк или None, чтобы не писать образцы.
+        """
+        self.sources = sources
+        self.poll_interval = poll_interval
+        self.aggregator = LogAggregator(normalizer)
+        self.rejects = RejectCollector()
+        # Учёт строк, отброшенных при дочитывании: используется только потоком дочитывания и пишет образцы
+        # (не больше max_samples на причину за всё время работы), а числа строк переносятся в rejects под блокировкой.
+        self._new_rejects = RejectCollector(rejects_file)
+        self._followers = [SourceFollower(source) for source in sources]
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._stop_event = threading.Event()
+        self._http_thread = None
+        self._http_server = ThreadingHTTPServer((host, port), _AnalysisRequestHandler)
+        self._http_server.analysis_server = self
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """
+        Возвращает адрес и порт, на которых слушает сервер.
+
+        :return: Пара (адрес, порт).
+        """
+        return self._http_server.server_address[:2]
+
+    def ingest(self) -> int:
+        """
+        Дочитывает новые строки из всех источников и добавляет их в агрегаты пакетами по мере чтения,
+        не накапливая записи в памяти.
+
+        :return: Число добавленных записей.
+        """
+        rejects = self._new_rejects
+        added = 0
+        for follower in self._followers:
+            for lines in follower.read_new_batches():
+                records = LogParser.parse_lines(lines, rejects, follower.source)
+                with self._lock:
+                    try:
+                        added += self.aggregator.add_rows(records, self._skip_record)
+                    finally:
+                        self.rejects.merge(rejects)
+                        rejects.counts = {}
+        if added:
+            LOGGER.debug("Ingested %d records", added)
+        return added
+
+    def query(self, endpoint: str, params: dict[str, str]) -> dict:
+        """
+        Возвращает отчёт по эндпоинту, используя кэш.
+
+        :param endpoint: Имя отчёта: overall, statuses, users, days, resources или rejects.
+        :param params: Параметры запроса from, to и lines.
+        :raises KeyError: Если эндпоинт неизвестен.
+        :raises ValueError: Если параметры заданы некорректно.
+        :return: Отчёт, готовый к сериализации в JSON.
+        """
+        if endpoint not in self.ENDPOINTS:
+            raise KeyError(endpoint)
+
+        start_date = self._parse_date(params.get("from"))
+        finish_date = self._parse_date(params.get("to"))
+        lines = int(params.get("lines", self.DEFAULT_LINES))
+
+        with self._lock:
+            # Ответы, посчитанные до добавления новых данных, больше не совпадают по ключу и вытесняются из кэша.
+            key = (endpoint, start_date, finish_date, lines, self.aggregator.version, self.rejects.total)
+            report = self._cache.get(key)
+            if report is None:
+                report = self.ENDPOINTS[endpoint](self, start_date, finish_date, lines)
+                self._cache[key] = report
+                if len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+        return report
+
+    def start(self) -> None:
+        """
+        Выполняет первичное чтение источников и запускает в фоновых потоках HTTP-сервер и дочитывание логов.
+        """
+        self.ingest()
+        self._stop_event.clear()
+        threading.Thread(target=self._ingest_loop, daemon=True).start()
+        self._http_thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+        self._http_thread.start()
+        LOGGER.info("Serving on http://%s:%d", *self.address)
+
+    def serve_forever(self) -> None:
+        """
+        Запускает сервер и блокирует текущий поток до прерывания.
+        """
+        self.start()
+        try:
+            self._stop_event.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """
+        Останавливает HTTP-сервер и дочитывание логов.
+        """
+        self._stop_event.set()
+        if self._http_thread is not None:
+            self._http_server.shutdown()
+            self._http_thread = None
+        self._http_server.server_close()
+        self._new_rejects.close()
+
+    def _ingest_loop(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.ingest()
+            except OSError:
+                LOGGER.exception("Failed to read log sources")
+            except Exception:
+                # Поток дочитывания не должен завершаться: иначе сервер продолжит отвечать устаревшими данными.
+                LOGGER.exception("Failed to ingest new log lines")
+
+    @staticmethod
+    def _skip_record(record, error: Exception) -> None:
+        LOGGER.warning("Skipped a record that could not be aggregated (%s): %r", error, record)
+
+    @staticmethod
+    def _parse_date(value: str | None) -> date | None:
+        return datetime.fromisoformat(value).date() if value else None
+
+    def _overall_report(self, start_date: date | None, finish_date: date | None, lines: int) -> dict:
+        return {
+            "files": self.sources,
+            "start_date": str(start_date),
+            "end_date": str(finish_date),
+            "requests": self.aggregator.get_requests_quantity(start_date, finish_date),
+            "average_response_size": self.aggregator.get_average_response_size(start_date, finish_date),
+        }
+
+    def _statuses_report(self, start_date: date | None, finish_date: date | None, lines: int) -> dict:
+        statuses = self.aggregator.get_the_most_popular_statuses(lines, start_date, finish_date)
+        return {"rows": [{"status": str(status), "responses": count} for status, count in statuses]}
+
+    def _users_report(self, start_date: date | None, finish_date: date | None, lines: int) -> dict:
+        users = self.aggregator.get_the_most_active_users(lines, start_date, finish_date)
+        return {"rows": [{"user_ip": user_ip, "requests": count} for user_ip, count in users]}
+
+    def _days_report(self, start_date: date | None, finish_date: date | None, lines: int) -> dict:
+        days = self.aggregator.get_the_most_high_loaded_days(lines, start_date, finish_date)
+        return {"rows": [{"day": str(day), "requests": count} for day, count in days]}
+
+    def _resources_report(self, start_date: date | None, finish_date: date | None, lines: int) -> dict:
+        resources = self.aggregator.get_the_most_popular_resources(lines, start_date, finish_date)
+        return {"rows": [{"resource": resource, "value": count} for resource, count in resources]}
+
+    def _rejects_report(self, start_date: date | None, finish_date: date | None, lines: int) -> dict:
+        return {"rows": [
+            {"source": source, "reason": reason, "lines": count}
+            for source, source_counts in self.rejects.counts.items()
+            for reason, count in source_counts.most_common()
+        ]}
+
+    ENDPOINTS = {
+        "overall": _overall_report,
+        "statuses": _statuses_report,
+        "users": _users_report,
+        "days": _days_report,
+        "resources": _resources_report,
+        "rejects": _rejects_report,
+    }
+
+
+class _AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик HTTP-запросов, передающий их в AnalysisServer.
+    """
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        try:
+            report = self.server.analysis_server.query(url.path.strip("/"), params)
+        except KeyError:
+            self._send_json(404, {"error": f"Unknown report: {url.path}"})
+        except ValueError as error:
+            self._send_json(400, {"error": str(error)})
+        else:
+            self._send_json(200, report)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        LOGGER.debug(format, *args)
@@ -0,0 +1,70 @@
+import os
+from collections.abc import Iterator
+from itertools import islice
+
+from src.log_workers.log_parser import LogParser
+
+
+class SourceFollower:
+    """
+    Класс для инкрементального чтения одного источника логов.
+
+    Для локального файла запоминается смещение прочитанных данных, поэтому при каждом вызове
+    read_new_batches возвращаются только дописанные с прошлого раза полные строки. Если файл стал
+    короче запомненного смещения (ротация или усечение), он читается заново с начала.
+    URL и сжатые файлы читаются один раз. Источник читается пакетами ограниченного размера,
+    поэтому память не зависит от объёма новых данных.
+    """
+
+    CHUNK_SIZE = 1 << 20
+    BATCH_LINES = 8192
+
+    def __init__(self, source: str):
+        """
+        Инициализирует чтение источника с начала.
+
+        :param source: Путь к локальному файлу или URL.
+        """
+        self.source = source
+        self._offset = 0
+        self._partial_line = b""
+        self._is_read_once = False
+
+    def read_new_batches(self) -> Iterator[list[str]]:
+        """
+        Лениво считывает строки, появившиеся в источнике с предыдущего вызова. Смещение сдвигается
+        по мере выдачи пакетов, поэтому прерванное чтение продолжается со следующего вызова.
+
+        :return: Итератор по пакетам новых полных строк.
+        """
+        if LogParser.is_url(self.source) or LogParser.is_compressed(self.source):
+            if self._is_read_once:
+                return
+            self._is_read_once = True
+            lines = LogParser.iter_source(self.source)
+            while batch := list(islice(lines, self.BATCH_LINES)):
+                yield batch
+            return
+
+        try:
+            file_size = os.path.getsize(self.source)
+        except FileNotFoundError:
+            return
+
+        if file_size < self._offset:
+            self._offset = 0
+            self._partial_line = b""
+
+        with open(self.source, "rb") as file:
+            file.seek(self._offset)
+            # Читаем не дальше размера на момент вызова: строки, дописанные во время чтения, попадут в следующий вызов.
+            while self._offset < file_size:
+                data = file.read(min(self.CHUNK_SIZE, file_size - self._offset))
+                if not data:
+                    break
+                self._offset += len(data)
+
+                data = self._partial_line + data
+                complete, separator, self._partial_line = data.rpartition(b"\n")
+                if separator:
+                    yield complete.decode("utf-8", errors="replace").split("\n")
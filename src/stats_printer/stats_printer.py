@@ -1,6 +1,8 @@
 from datetime import date
 
+from src.log_workers.anomaly_detectors import Anomaly
 from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.log_rejects import RejectCollector
 from src.table import Table
 
 
@@ -9,11 +11,17 @@ class StatsPrinter:
     Класс для отображения статистики из логов.
     """
 
-    def __init__(self, table_printer):
+    def __init__(self, table_printer, sources: list[str] | None = None, normalizer=None):
         """
         Инициализирует StatsPrinter с заданным форматом вывода таблиц.
+
+        :param table_printer: Принтер таблиц.
+        :param sources: Источники, по которым в таблицы добавляются столбцы с разбивкой, или None.
+        :param normalizer: ResourceNormalizer для группировки ресурсов или None.
         """
         self.table_printer = table_printer
+        self.sources = sources
+        self.normalizer = normalizer
 
     def print_overall_info(
             self, logs: Table, sources: list[str], from_date: date | None, to_date: date | None
@@ -27,13 +35,23 @@ class StatsPrinter:
         :param from_date: Начальная дата фильтрации логов, если указана.
         :param to_date: Конечная дата фильтрации логов, если указана.
         """
-        table = Table([
+        rows = [
             {"metrics": "Files", "value": str(sources)},
             {"metrics": "Start date", "value": str(from_date)},
             {"metrics": "End date", "value": str(to_date)},
             {"metrics": "Requests", "value": str(LogAnalyser.get_requests_quantity(logs))},
             {"metrics": "Average response size", "value": str(LogAnalyser.get_average_response_size(logs))}
-        ])
+        ]
+        if self.sources and LogAnalyser.has_source_breakdown(logs):
+            summary = LogAnalyser.get_sources_summary(logs, self.sources)
+            for source in self.sources:
+                requests, average_response_size = summary[source]
+                for row in rows[:3]:
+                    row[source] = "-"
+                rows[3][source] = str(requests)
+                rows[4][source] = str(average_response_size)
+
+        table = Table(rows)
         self.table_printer.print_table(table, table.size, header="Overall information")
 
     def print_most_popular_resources(self, logs: Table, lines_in_table: int) -> None:
@@ -43,8 +61,10 @@ class StatsPrinter:
         :param logs: Таблица логов.
         :param lines_in_table: Число строк для отображения в таблице.
         """
-        resources = LogAnalyser.get_the_most_popular_resources(logs, lines_in_table)
-        self.table_printer.print_table(resources, header="The most popular resources")
+        resources = LogAnalyser.get_the_most_popular_resources(
+            logs, lines_in_table, sources=self.sources, normalizer=self.normalizer
+        )
+        self.table_printer.print_table(resources, lines_quantity=lines_in_table, header="The most popular resources")
 
     def print_most_popular_statuses(self, logs: Table, lines_quantity: int) -> None:
         """
@@ -53,7 +73,7 @@ class StatsPrinter:
         :param logs: Таблица логов.
         :param lines_quantity: Число строк для отображения в таблице.
         """
-        statuses = LogAnalyser.get_the_most_popular_statuses(logs, lines_quantity)
+        statuses = LogAnalyser.get_the_most_popular_statuses(logs, lines_quantity, sources=self.sources)
         self.table_printer.print_table(statuses, lines_quantity=lines_quantity, header="The most popular statuses")
 
     def print_most_high_loaded_days(self, logs: Table, lines_quantity: int) -> None:
@@ -63,7 +83,7 @@ class StatsPrinter:
         :param logs: Таблица логов.
         :param lines_quantity: Число строк для отображения в таблице.
         """
-        days = LogAnalyser.get_the_most_high_loaded_days(logs, lines_quantity)
+        days = LogAnalyser.get_the_most_high_loaded_days(logs, lines_quantity, sources=self.sources)
         self.table_printer.print_table(days, lines_quantity=lines_quantity, header="The most highloaded days")
 
     def print_most_active_users(self, logs: Table, lines_quantity: int) -> None:
@@ -73,5 +93,38 @@ class StatsPrinter:
         :param logs: Таблица логов.
         :param lines_quantity: Число строк для отображения в таблице.
         """
-        users = LogAnalyser.get_the_most_active_users(logs, lines_quantity)
+        users = LogAnalyser.get_the_most_active_users(logs, lines_quantity, sources=self.sources)
         self.table_printer.print_table(users, lines_quantity=lines_quantity, header="The most active users")
+
+    def print_rejects(self, rejects: RejectCollector) -> None:
+        """
+        Печатает число строк, которые не удалось разобрать, по источникам (в алфавитном порядке:
+        источники читаются параллельно) и причинам.
+
+        :param rejects: Учёт отброшенных строк.
+        """
+        table = Table([
+            {"source": source, "reason": reason, "lines": str(count)}
+            for source, source_counts in sorted(rejects.counts.items())
+            for reason, count in source_counts.most_common()
+        ])
+        self.table_printer.print_table(table, table.size, header="Rejected lines")
+
+    def print_anomalies(self, anomalies: list[Anomaly], lines_quantity: int) -> None:
+        """
+        Печатает найденные аномалии в порядке времени.
+
+        :param anomalies: Список аномалий.
+        :param lines_quantity: Число строк для отображения в таблице.
+        """
+        table = Table([
+            {
+                "time": anomaly.time,
+                "detector": anomaly.detector,
+                "key": anomaly.key,
+                "value": str(anomaly.value),
+                "threshold": str(anomaly.threshold)
+            }
+            for anomaly in anomalies
+        ])
+        self.table_printer.print_table(table, lines_quantity=lines_quantity, header="Anomalies")
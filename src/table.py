@@ -1,14 +1,17 @@
 import itertools
+from array import array
+from collections.abc import Callable, Mapping
 
 
 class Table:
     """
     Класс Table релизует таблицу с данными, в которой каждая строка хранится в виде словаря стобцов.
     В таблице могут быть разные столбцы в разных строках..
+    Строкой может быть любой Mapping, например dict или LogRecord.
     """
     DEFAULT_CELL_VALUE = "None"
 
-    def __init__(self, rows: list[dict[str, str | None]]):
+    def __init__(self, rows: list[Mapping[str, str | int | None]]):
         """
         Инициализирует таблицу с переданными строками.
 
@@ -24,7 +27,7 @@ class Table:
         self.columns = list(keys)
 
     @property
-    def rows(self) -> list[dict[str, str | None]]:
+    def rows(self) -> list[Mapping[str, str | int | None]]:
         """
         Возвращает строки таблицы.
 
@@ -41,7 +44,7 @@ class Table:
         """
         return len(self._rows)
 
-    def add_rows(self, new_rows: list[dict[str, str]]) -> None:
+    def add_rows(self, new_rows: list[Mapping[str, str | int | None]]) -> None:
         """
         Добавляет заданные строки в таблицу.
 
@@ -51,7 +54,7 @@ class Table:
         new_columns = {key for row in new_rows for key in row}
         self.columns = list(set(self.columns).union(new_columns))
 
-    def add_row(self, new_row: dict[str, str]) -> None:
+    def add_row(self, new_row: Mapping[str, str | int | None]) -> None:
         """
         Добавляет одну заданную строку в таблицу.
 
@@ -82,13 +85,13 @@ class Table:
             raise ValueError("No such column")
 
         max_length = max(
-            (len(row.get(column, self.DEFAULT_CELL_VALUE))
+            (len(str(row.get(column, self.DEFAULT_CELL_VALUE)))
              for row in self._rows),
             default=0
         )
         return max(max_length, len(column))
 
-    def get_cell(self, row_ind: int, column: str) -> str | None:
+    def get_cell(self, row_ind: int, column: str) -> str | int | None:
         """
         Возвращает значение в ячейке таблицы по заданной строке и столбцу.
 
@@ -97,3 +100,106 @@ class Table:
         :return: Значение в ячейке (DEFAULT_CELL_VALUE, если значение отсутствует).
         """
         return self._rows[row_ind].get(column, self.DEFAULT_CELL_VALUE)
+
+    def filter(self, predicate: Callable[[Mapping[str, str | int | None]], bool]) -> "TableView":
+        """
+        Возвращает ленивое представление таблицы, содержащее только строки, удовлетворяющие условию.
+        Строки не копируются и не просматриваются до первого обращения к представлению.
+
+        :param predicate: Функция, принимающая строку и возвращающая True, если строку нужно оставить.
+        :return: Представление таблицы.
+        """
+        return TableView(self, (predicate,))
+
+
+class TableView(Table):
+    """
+    Класс TableView реализует ленивое представление таблицы: исходная таблица плюс набор условий отбора.
+    Условия последовательных filter объединяются без создания промежуточных таблиц. Строки просматриваются
+    один раз, при первом обращении к представлению: номера отобранных строк запоминаются в массиве,
+    и последующие обращения (rows, size, ячейки) идут по нему без повторной проверки условий.
+    """
+
+    def __init__(self, parent: Table, predicates: tuple[Callable[[Mapping[str, str | int | None]], bool], ...],
+                 base: "TableView | None" = None):
+        """
+        Инициализирует представление над исходной таблицей.
+
+        :param parent: Исходная таблица (не представление).
+        :param predicates: Условия, которым должна удовлетворять каждая строка представления.
+        :param base: Представление, среди строк которого выполняется отбор, или None для всех строк parent.
+        """
+        self._parent = parent
+        self._predicates = predicates
+        self._base = base
+        self._selection = None
+        self.columns = parent.columns
+
+    @property
+    def selection(self) -> array:
+        """
+        Возвращает номера отобранных строк исходной таблицы. Отбор выполняется при первом обращении.
+
+        :return: Массив номеров строк.
+        """
+        if self._selection is None:
+            rows = self._parent.rows
+            indices = range(len(rows)) if self._base is None else self._base.selection
+            predicates = self._predicates
+            if len(predicates) == 1:
+                predicate = predicates[0]
+                selected = (index for index in indices if predicate(rows[index]))
+            else:
+                selected = (index for index in indices if all(predicate(rows[index]) for predicate in predicates))
+            self._selection = array("q", selected)
+        return self._selection
+
+    @property
+    def rows(self) -> list[Mapping[str, str | int | None]]:
+        """
+        Возвращает отобранные строки. Строки не копируются: в списке лежат ссылки на строки исходной таблицы.
+
+        :return: Список строк представления.
+        """
+        rows = self._parent.rows
+        return [rows[index] for index in self.selection]
+
+    @property
+    def size(self) -> int:
+        """
+        Возвращает число отобранных строк.
+
+        :return: Число строк.
+        """
+        return len(self.selection)
+
+    @property
+    def _rows(self) -> list[Mapping[str, str | int | None]]:
+        return self.rows
+
+    def get_cell(self, row_ind: int, column: str) -> str | int | None:
+        return self._parent.rows[self.selection[row_ind]].get(column, self.DEFAULT_CELL_VALUE)
+
+    def filter(self, predicate: Callable[[Mapping[str, str | int | None]], bool]) -> "TableView":
+        """
+        Добавляет условие отбора к представлению, не просматривая строки. Если отбор этого представления
+        уже выполнен, новое условие проверяется только для отобранных строк.
+
+        :param predicate: Функция, принимающая строку и возвращающая True, если строку нужно оставить.
+        :return: Новое представление над той же исходной таблицей.
+        """
+        if self._selection is not None:
+            return TableView(self._parent, (predicate,), self)
+        return TableView(self._parent, self._predicates + (predicate,), self._base)
+
+    def add_rows(self, new_rows: list[Mapping[str, str | int | None]]) -> None:
+        """
+        :raises ValueError: В представление нельзя добавлять строки.
+        """
+        raise ValueError("Cannot add rows to a table view")
+
+    def add_row(self, new_row: Mapping[str, str | int | None]) -> None:
+        """
+        :raises ValueError: В представление нельзя добавлять строки.
+        """
+        raise ValueError("Cannot add rows to a table view")
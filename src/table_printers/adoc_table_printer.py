@@ -2,7 +2,6 @@ import logging
 
 from src.table_printers.table_printer import TablePrinter
 
-logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger(__name__)
 
 
@@ -3,7 +3,6 @@ import logging
 from src.table import Table
 from src.table_printers.table_printer import TablePrinter
 
-logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger(__name__)
 
 
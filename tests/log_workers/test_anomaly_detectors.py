@@ -0,0 +1,86 @@
+import unittest
+from src.log_workers.anomaly_detectors import (
+    ErrorRateDetector, IpRateDetector, ResourceDominanceDetector, SlidingWindowCounter
+)
+from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.resource_normalizer import ResourceNormalizer
+from src.table import Table
+
+
+def make_log(second, remote_addr="192.168.1.1", status=200, request="/index.html"):
+    minute, second = divmod(second, 60)
+    hour, minute = divmod(minute, 60)
+    return {
+        "remote_addr": remote_addr,
+        "time_local": f"08/Nov/2024:{10 + hour:02d}:{minute:02d}:{second:02d} +0000",
+        "request": request,
+        "status": status,
+    }
+
+
+class TestSlidingWindowCounter(unittest.TestCase):
+
+    def test_old_events_expire(self):
+        counter = SlidingWindowCounter(window_seconds=60, buckets=6)
+        self.assertEqual(counter.add(0), 1)
+        self.assertEqual(counter.add(30), 2)
+        self.assertEqual(counter.add(65), 2, "Событие на 0-й секунде должно выйти из окна")
+        self.assertEqual(counter.add(1000), 1, "После долгой паузы в окне должно остаться одно событие")
+
+
+class TestAnomalyDetectors(unittest.TestCase):
+
+    def test_get_log_timestamp(self):
+        self.assertEqual(LogAnalyser.get_log_timestamp({"time_local": "08/Nov/2024:10:52:20 +0300"}), 1731052340,
+                         "Время должно учитывать часовой пояс записи")
+
+    def test_ip_rate_detector(self):
+        logs = Table([make_log(second) for second in range(10)] +
+                     [make_log(second, remote_addr="10.0.0.1") for second in range(0, 600, 30)])
+        anomalies = LogAnalyser.detect_anomalies(logs, [IpRateDetector(max_requests=5)])
+        self.assertEqual([anomaly.key for anomaly in anomalies], ["192.168.1.1"],
+                         "Аномалией должен быть только адрес с 10 запросами за минуту, и только один раз")
+        self.assertEqual(anomalies[0].value, 6)
+
+    def test_ip_rate_detector_evicts_idle_keys(self):
+        def detect(remote_addrs):
+            logs = Table([make_log(second, remote_addr=remote_addr) for second, remote_addr in enumerate(remote_addrs)])
+            return LogAnalyser.detect_anomalies(logs, [IpRateDetector(max_requests=2, max_keys=2)])
+
+        self.assertEqual([anomaly.key for anomaly in detect(["a", "b", "a", "c", "a"])], ["a"],
+                         "Активный адрес не должен вытесняться, и его счётчик должен сохраняться")
+        self.assertEqual(detect(["a", "a", "b", "c", "a"]), [],
+                         "Дольше всех неактивный адрес должен вытесняться, и его счёт должен начинаться заново")
+
+    def test_error_rate_detector(self):
+        rows = [make_log(second, status=500 if second % 30 == 0 else 200) for second in range(300)]
+        rows += [make_log(second, status=502) for second in range(300, 360)]
+        anomalies = LogAnalyser.detect_anomalies(Table(rows), [ErrorRateDetector(min_requests=10)])
+        self.assertEqual(len(anomalies), 1, "Должен быть найден один всплеск ошибок 5xx")
+        self.assertEqual(anomalies[0].value, 1.0)
+
+    def test_resource_dominance_detector(self):
+        rows = [make_log(second, request=f"/page_{second % 10}") for second in range(300)]
+        rows += [make_log(second, request="/wp-login.php") for second in range(300, 360)]
+        anomalies = LogAnalyser.detect_anomalies(Table(rows), [ResourceDominanceDetector(min_requests=10)])
+        self.assertEqual([anomaly.key for anomaly in anomalies], ["/wp-login.php"],
+                         "Новый ресурс, занявший весь трафик, должен считаться аномалией")
+
+    def test_resource_dominance_uses_normalizer(self):
+        rows = [make_log(second, request=f"/page_{second % 10}") for second in range(300)]
+        rows += [make_log(second, request=f"/login?next={second}") for second in range(300, 360)]
+        normalizer = ResourceNormalizer()
+        anomalies = LogAnalyser.detect_anomalies(
+            Table(rows), [ResourceDominanceDetector(min_requests=10, normalizer=normalizer)]
+        )
+        self.assertEqual([anomaly.key for anomaly in anomalies], ["/login"],
+                         "Запросы одного маршрута с разными параметрами должны считаться одним ресурсом")
+
+    def test_resource_dominance_baseline_decays(self):
+        rows = [make_log(second, request="/download") for second in range(60)]
+        rows += [make_log(second, request=f"/page_{second % 10}") for second in range(60, 1860)]
+        rows += [make_log(second, request="/download" if second % 5 else f"/page_{second % 10}")
+                 for second in range(1860, 1920)]
+        anomalies = LogAnalyser.detect_anomalies(Table(rows), [ResourceDominanceDetector(min_requests=10)])
+        self.assertEqual([anomaly.key for anomaly in anomalies], ["/download"],
+                         "Базовая доля ресурса должна затухать в окнах, где его нет")
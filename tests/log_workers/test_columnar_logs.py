@@ -0,0 +1,100 @@
+import importlib.util
+import unittest
+from datetime import date
+from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.log_parser import LogParser
+from src.table import Table
+
+NUMPY_INSTALLED = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(NUMPY_INSTALLED, "NumPy не установлен")
+class TestColumnarLogs(unittest.TestCase):
+
+    def setUp(self):
+        from src.log_workers.columnar_logs import ColumnarLogs
+
+        self.lines = [
+            '192.168.1.1 - - [08/Nov/2024:10:52:20 +0000] "GET /index.html HTTP/1.1" 200 1024 "-" "Mozilla/5.0"',
+            '192.168.1.2 - - [08/Nov/2024:11:00:00 +0000] "POST /form_submit HTTP/1.1" 404 2048 "-" "Mozilla/5.0"',
+            '192.168.1.1 - - [09/Nov/2024:15:30:00 +0000] "GET /about HTTP/1.1" 200 512 "-" "curl/7.68.0"',
+            '192.168.1.3 - - [10/Nov/2024:15:30:00 +0000] "GET /index.html HTTP/1.1" 500 0 "-" "curl/7.68.0"',
+        ]
+        self.table = LogParser.parse_logs(self.lines)
+        self.columnar = ColumnarLogs.from_rows(self.table.rows)
+
+    def test_size(self):
+        self.assertEqual(LogAnalyser.get_requests_quantity(self.columnar), 4, "Должно быть 4 записи")
+
+    def test_top_tables_match_python_backend(self):
+        for method in (LogAnalyser.get_the_most_popular_statuses, LogAnalyser.get_the_most_high_loaded_days,
+                       LogAnalyser.get_the_most_active_users, LogAnalyser.get_the_most_popular_resources):
+            self.assertEqual(method(self.columnar, 2).rows, method(self.table, 2).rows,
+                             f"{method.__name__} должен совпадать с Python-реализацией")
+
+    def test_sizes_match_python_backend(self):
+        self.assertAlmostEqual(LogAnalyser.get_average_response_size(self.columnar),
+                               LogAnalyser.get_average_response_size(self.table))
+        self.assertAlmostEqual(LogAnalyser.get_response_size_percentile(self.columnar, 95),
+                               LogAnalyser.get_response_size_percentile(self.table, 95))
+
+    def test_date_constraints(self):
+        constrained = LogAnalyser.get_date_constrained_logs(self.columnar, date(2024, 11, 9), date(2024, 11, 10))
+        self.assertEqual(constrained.size, 2, "Должно быть 2 лога между 09/Nov/2024 и 10/Nov/2024")
+        self.assertEqual(LogAnalyser.set_to_date_constraint(self.columnar, date(2024, 11, 8)).size, 2,
+                         "Должно быть 2 лога до 08/Nov/2024 включительно")
+
+    def test_normalized_resources_match_python_backend(self):
+        from src.log_workers.resource_normalizer import ResourceNormalizer
+
+        normalizer = ResourceNormalizer(route_depth=1)
+        self.assertEqual(
+            LogAnalyser.get_the_most_popular_resources(self.columnar, 2, normalizer=normalizer).rows,
+            LogAnalyser.get_the_most_popular_resources(self.table, 2, normalizer=normalizer).rows,
+            "Группировка ресурсов должна совпадать с Python-реализацией"
+        )
+
+    def test_source_breakdown_matches_python_backend(self):
+        from src.log_workers.columnar_logs import ColumnarLogs
+
+        rows = LogParser.parse_lines(self.lines)
+        for index, row in enumerate(rows):
+            row.source = "a.log" if index < 2 else "b.log"
+        table = Table(rows)
+        columnar = ColumnarLogs.from_rows(rows)
+        sources = ["a.log", "b.log"]
+        for method in (LogAnalyser.get_the_most_popular_statuses, LogAnalyser.get_the_most_high_loaded_days,
+                       LogAnalyser.get_the_most_active_users, LogAnalyser.get_the_most_popular_resources):
+            self.assertEqual(method(columnar, 3, sources=sources).rows, method(table, 3, sources=sources).rows,
+                             f"{method.__name__} должен добавлять столбцы источников, как Python-реализация")
+        self.assertEqual(LogAnalyser.get_sources_summary(columnar.between_days(date(2024, 11, 9), None), sources),
+                         {"a.log": (0, 0.0), "b.log": (2, 256.0)})
+
+    def test_builder_matches_from_rows(self):
+        from src.log_workers.columnar_logs import ColumnarLogs, ColumnarLogsBuilder
+
+        builder = ColumnarLogsBuilder(batch_size=3)
+        for row in self.table.rows:
+            builder.add(row)
+        built = builder.build()
+        dict_rows = ColumnarLogs.from_rows([dict(row) for row in self.table.rows], batch_size=2)
+        for logs in (built, dict_rows):
+            self.assertEqual(logs.most_common_ips(None), self.columnar.most_common_ips(None),
+                             "Коды значений должны сохраняться между пакетами")
+            self.assertEqual(logs.most_common_days(None), self.columnar.most_common_days(None))
+            self.assertEqual(logs.most_common_resources(None, "GET"), self.columnar.most_common_resources(None, "GET"))
+            self.assertEqual(logs.bytes_sent.tolist(), [1024, 2048, 512, 0])
+
+    def test_ties_order(self):
+        from src.log_workers.columnar_logs import ColumnarLogs
+
+        logs = ColumnarLogs.from_rows([
+            {"remote_addr": remote_addr, "time_local": f"{day}/Nov/2024:10:00:00 +0000", "request_type": "GET",
+             "request": "/", "status": status, "body_bytes_sent": "0"}
+            for remote_addr, day, status in [("10.0.0.2", "09", "500"), ("localhost", "08", "200")]
+        ])
+        self.assertEqual(logs.most_common_ips(2), [("10.0.0.2", 1), ("127.0.0.1", 1)],
+                         "Адреса с равными частотами должны идти в порядке первого появления")
+        self.assertEqual(logs.most_common_statuses(2), [(200, 1), (500, 1)],
+                         "Статусы с равными частотами должны идти по возрастанию")
+        self.assertEqual(logs.most_common_days(2), [(date(2024, 11, 8), 1), (date(2024, 11, 9), 1)])
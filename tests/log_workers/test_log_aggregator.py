@@ -0,0 +1,92 @@
+import unittest
+from datetime import date
+from src.log_workers.log_aggregator import LogAggregator
+from src.log_workers.log_analyser import LogAnalyser
+from src.table import Table
+
+
+class TestLogAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {
+                "remote_addr": "192.168.1.1", "time_local": "08/Nov/2024:10:52:20 +0000", "request_type": "GET",
+                "request": "/index.html", "status": "200", "body_bytes_sent": "1024"
+            },
+            {
+                "remote_addr": "192.168.1.2", "time_local": "08/Nov/2024:11:00:00 +0000", "request_type": "POST",
+                "request": "/form_submit", "status": "404", "body_bytes_sent": "2048"
+            },
+            {
+                "remote_addr": "localhost", "time_local": "09/Nov/2024:15:30:00 +0000", "request_type": "GET",
+                "request": "/about", "status": "200", "body_bytes_sent": "512"
+            }
+        ]
+        self.aggregator = LogAggregator()
+        self.aggregator.add_rows(self.rows)
+
+    def test_add_rows_increments_version(self):
+        version = self.aggregator.version
+        self.assertEqual(self.aggregator.add_rows([]), 0, "Пустой пакет не должен добавлять записи")
+        self.assertEqual(self.aggregator.version, version, "Пустой пакет не должен менять version")
+        self.aggregator.add_rows(self.rows[:1])
+        self.assertEqual(self.aggregator.version, version + 1, "Новые данные должны увеличивать version")
+
+    def test_matches_log_analyser(self):
+        table = Table(self.rows)
+        self.assertEqual(self.aggregator.get_requests_quantity(), LogAnalyser.get_requests_quantity(table))
+        self.assertAlmostEqual(self.aggregator.get_average_response_size(),
+                               LogAnalyser.get_average_response_size(table))
+        self.assertEqual(self.aggregator.get_the_most_active_users(1), [("192.168.1.1", 1)],
+                         "Самый активный пользователь должен быть с IP '192.168.1.1'")
+        self.assertEqual(self.aggregator.get_the_most_active_users(3)[2], ("127.0.0.1", 1),
+                         "localhost должен учитываться как 127.0.0.1")
+
+    def test_date_range(self):
+        start_date = date(2024, 11, 9)
+        self.assertEqual(self.aggregator.get_requests_quantity(start_date), 1,
+                         "Должен быть только 1 запрос начиная с 09/Nov/2024")
+        self.assertEqual(self.aggregator.get_the_most_popular_statuses(5, finish_date=date(2024, 11, 8)),
+                         [(200, 1), (404, 1)], "До 08/Nov/2024 должно быть по одному ответу 200 и 404")
+        self.assertEqual(self.aggregator.get_the_most_popular_resources(5, start_date),
+                         [("/about", 1)], "Начиная с 09/Nov/2024 должен быть запрошен только '/about'")
+        self.assertEqual(self.aggregator.get_the_most_high_loaded_days(1), [(date(2024, 11, 8), 2)],
+                         "Самый нагруженный день должен быть 2024-11-08")
+
+    def test_aggregated_logs_match_log_analyser(self):
+        logs = self.aggregator.between_days(date(2024, 11, 8), date(2024, 11, 8))
+        table = LogAnalyser.get_date_constrained_logs(Table(self.rows), date(2024, 11, 8), date(2024, 11, 8))
+        self.assertTrue(LogAnalyser.is_precomputed(logs), "AggregatedLogs должны считаться предвычисленными")
+        self.assertEqual(LogAnalyser.get_requests_quantity(logs), LogAnalyser.get_requests_quantity(table))
+        self.assertEqual(LogAnalyser.get_the_most_popular_statuses(logs, 5).rows,
+                         LogAnalyser.get_the_most_popular_statuses(table, 5).rows)
+        self.assertEqual(LogAnalyser.get_the_most_popular_resources(logs, 5, "POST").rows,
+                         LogAnalyser.get_the_most_popular_resources(table, 5, "POST").rows)
+        self.assertEqual(LogAnalyser.get_date_constrained_logs(logs, date(2024, 11, 9)).size, 0,
+                         "Сужение периода должно давать пересечение с исходным периодом")
+
+    def test_add_day_aggregates(self):
+        other = LogAggregator()
+        other.add_rows(self.rows)
+        for day in other.get_days():
+            self.aggregator.add_day_aggregates(day, other.get_day_aggregates(day))
+        self.assertEqual(self.aggregator.get_requests_quantity(), 6, "Агрегаты дней должны складываться")
+        self.assertEqual(self.aggregator.get_the_most_popular_statuses(1), [(200, 4)])
+
+    def test_source_breakdown(self):
+        sources = ["first.log", "second.log"]
+        rows = [{**row, "source": source} for row, source in zip(self.rows, ["first.log", "second.log", "first.log"])]
+        source_aggregators = {source: LogAggregator() for source in sources}
+        for row in rows:
+            source_aggregators[row["source"]].add_row(row)
+
+        logs = self.aggregator.between_days(sources=source_aggregators)
+        table = Table(rows)
+        for get_top in (LogAnalyser.get_the_most_popular_statuses, LogAnalyser.get_the_most_high_loaded_days,
+                        LogAnalyser.get_the_most_active_users):
+            self.assertEqual(get_top(logs, 5, sources=sources).rows, get_top(table, 5, sources=sources).rows,
+                             "Разбивка по агрегатам источников должна совпадать с разбивкой по строкам")
+        self.assertEqual(LogAnalyser.get_the_most_popular_resources(logs, 5, sources=sources).rows,
+                         LogAnalyser.get_the_most_popular_resources(table, 5, sources=sources).rows)
+        self.assertEqual(LogAnalyser.get_sources_summary(logs, sources),
+                         LogAnalyser.get_sources_summary(table, sources))
@@ -70,6 +70,12 @@ class TestLogAnalyser(unittest.TestCase):
                          EPS,
                          f"Средний размер ответа должен быть {correct_avg_size} байт")
 
+    def test_get_response_size_percentile(self):
+        self.assertEqual(LogAnalyser.get_response_size_percentile(self.logs, 50), 1024.0,
+                         "Медиана размера ответа должна быть 1024 байта")
+        self.assertEqual(LogAnalyser.get_response_size_percentile(self.logs, 95), 1945.6,
+                         "95% перцентиль размера ответа должен интерполироваться линейно")
+
     def test_get_the_most_high_loaded_days(self):
         popular_days = LogAnalyser.get_the_most_high_loaded_days(self.logs, 2)
         self.assertEqual(popular_days.size, 2, "Должно быть 2 дня с самой высокой нагрузкой")
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.log_merger import LogMerger
+from src.log_workers.log_rejects import RejectCollector
+from src.table import Table
+
+
+def make_line(time_local, remote_addr="192.168.1.1", status=200):
+    return f'{remote_addr} - - [{time_local}] "GET /index.html HTTP/1.1" {status} 100 "-" "Mozilla/5.0"\n'
+
+
+class TestLogMerger(unittest.TestCase):
+
+    def setUp(self):
+        self.paths = []
+        self.first = self.write_source([
+            make_line("08/Nov/2024:10:00:00 +0000"),
+            make_line("08/Nov/2024:10:00:10 +0000"),
+            "garbage\n",
+        ])
+        self.second = self.write_source([
+            make_line("08/Nov/2024:13:00:05 +0300", remote_addr="10.0.0.1", status=404),
+            make_line("09/Nov/2024:10:00:00 +0000", remote_addr="10.0.0.1"),
+        ])
+
+    def tearDown(self):
+        for path in self.paths:
+            os.remove(path)
+
+    def write_source(self, lines):
+        descriptor, path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(descriptor, "w") as file:
+            file.writelines(lines)
+        self.paths.append(path)
+        return path
+
+    def test_merge_orders_by_time_and_tags_source(self):
+        rejects = RejectCollector()
+        records = list(LogMerger.merge([self.first, self.second], rejects))
+        self.assertEqual([record.source for record in records], [self.first, self.second, self.first, self.second],
+                         "Записи должны идти в порядке времени с учётом часового пояса")
+        self.assertEqual(records[0]["source"], self.first, "Источник должен быть доступен как столбец")
+        self.assertEqual(rejects.counts[self.first][RejectCollector.MALFORMED], 1,
+                         "Отброшенная строка должна учитываться в своём источнике")
+
+    def test_merge_is_lazy(self):
+        merged = LogMerger.merge([self.first, self.second])
+        self.assertEqual(next(merged).source, self.first, "Слияние должно выдавать записи по одной")
+
+    def test_source_breakdown(self):
+        sources = [self.first, self.second]
+        logs = Table(list(LogMerger.merge(sources)))
+
+        statuses = LogAnalyser.get_the_most_popular_statuses(logs, 2, sources=sources)
+        self.assertEqual(statuses.rows[0], {"status": "200", "responses": "3", self.first: "2", self.second: "1"},
+                         "Для каждого статуса должно выводиться число ответов по источникам")
+
+        summary = LogAnalyser.get_sources_summary(logs, sources)
+        self.assertEqual(summary[self.second], (2, 100.0), "Во втором источнике 2 запроса по 100 байт")
@@ -1,4 +1,6 @@
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from src.log_workers.log_parser import LogParser
 from src.table import Table
 
@@ -23,8 +25,8 @@ class TestLogParser(unittest.TestCase):
             "request_type": "GET",
             "request": "/index.html",
             "protocol": "HTTP/1.1",
-            "status": "200",
-            "body_bytes_sent": "1024",
+            "status": 200,
+            "body_bytes_sent": 1024,
             "http_referer": "https://example.com",
             "http_user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
         }
@@ -44,3 +46,38 @@ class TestLogParser(unittest.TestCase):
         self.assertIn("remote_addr", LogParser.column_names, "Должен присутствовать столбец 'remote_addr'")
         self.assertIn("status", LogParser.column_names, "Должен присутствовать столбец 'status'")
         self.assertEqual(len(LogParser.column_names), 10, "Должно быть ровно 10 столбцов в column_names")
+
+    def test_parse_log_interns_repeated_values(self):
+        first = LogParser.parse_log(self.valid_log)
+        second = LogParser.parse_log(self.valid_log)
+        self.assertIs(first.remote_addr, second.remote_addr, "IP-адрес должен храниться в одном экземпляре")
+        self.assertIs(first.http_user_agent, second.http_user_agent,
+                      "User-Agent должен храниться в одном экземпляре")
+        self.assertIsInstance(first.status, int, "Статус должен храниться как int")
+
+    def test_parse_log_invalid_time(self):
+        for time_local in ("08/Foo/2024:10:52:20 +0000", "31/Feb/2024:10:52:20 +0000", "08/Nov/2024:25:00:00 +0000"):
+            log = self.valid_log.replace("08/Nov/2024:10:52:20 +0000", time_local)
+            self.assertIsNone(LogParser.parse_log(log), f"Строка с временем {time_local} должна отбрасываться")
+
+    def test_iter_source_streams_url(self):
+        body = (self.valid_log + "\n") * 3
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.end_headers()
+                self.wfile.write(body.encode())
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        host, port = server.server_address[:2]
+        lines = list(LogParser.iter_source(f"http://{host}:{port}/access.log"))
+        self.assertEqual(lines, [self.valid_log + "\n"] * 3, "Тело ответа должно читаться построчно")
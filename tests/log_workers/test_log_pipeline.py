@@ -0,0 +1,75 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from src.log_workers.log_aggregator import LogAggregator
+from src.log_workers.log_pipeline import AdaptiveBatchSize, LogPipeline
+from src.log_workers.log_rejects import RejectCollector
+
+
+class TestAdaptiveBatchSize(unittest.TestCase):
+
+    def test_batch_size_follows_throughput(self):
+        batch_size = AdaptiveBatchSize(initial=1000, minimum=10, maximum=100000, target_seconds=0.1)
+        for _ in range(20):
+            batch_size.record(1000, 0.01)
+        self.assertGreater(batch_size.value, 9000, "Быстрый потребитель должен получать большие пакеты")
+        for _ in range(20):
+            batch_size.record(1000, 10.0)
+        self.assertEqual(batch_size.value, 10, "Медленный потребитель должен получать пакеты минимального размера")
+
+
+class TestLogPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.line = (
+            '192.168.1.1 - - [08/Nov/2024:10:52:20 +0000] '
+            '"GET /index.html HTTP/1.1" 200 1024 "-" "Mozilla/5.0"\n'
+        )
+        self.paths = []
+        for lines in ([self.line] * 250 + ["garbage\n"], [self.line] * 50):
+            descriptor, path = tempfile.mkstemp(suffix=".log")
+            with os.fdopen(descriptor, "w") as file:
+                file.writelines(lines)
+            self.paths.append(path)
+
+    def tearDown(self):
+        for path in self.paths:
+            os.remove(path)
+
+    def test_batches_feed_aggregator(self):
+        rejects = RejectCollector()
+        pipeline = LogPipeline(self.paths, rejects, queue_size=1,
+                               batch_size=AdaptiveBatchSize(initial=16, minimum=16, maximum=64))
+        aggregator = LogAggregator()
+        sources = set()
+        for source, batch in pipeline.batches():
+            self.assertLessEqual(len(batch), 64, "Пакет не должен превышать максимальный размер")
+            sources.update(record.source for record in batch)
+            aggregator.add_rows(batch)
+
+        self.assertEqual(aggregator.get_requests_quantity(), 300, "Все корректные строки должны дойти до агрегатора")
+        self.assertEqual(sources, set(self.paths), "Записи должны быть помечены источником")
+        self.assertEqual(rejects.total, 1, "Некорректная строка должна быть учтена")
+
+    def test_batch_size_follows_slow_reading(self):
+        def slow_source(source):
+            for _ in range(300):
+                time.sleep(0.001)
+                yield self.line
+
+        batch_size = AdaptiveBatchSize(initial=100, minimum=1, maximum=10000, target_seconds=0.01)
+        with patch("src.log_workers.log_pipeline.LogParser.iter_source", slow_source):
+            for _ in LogPipeline(self.paths[:1], batch_size=batch_size).batches():
+                pass
+        self.assertLess(batch_size.value, 100, "Медленное чтение должно уменьшать пакеты, даже если парсинг быстрый")
+
+    def test_stage_error_is_raised(self):
+        with self.assertRaises(FileNotFoundError):
+            list(LogPipeline(["/nonexistent/access.log"]).batches())
+
+    def test_early_stop_does_not_hang(self):
+        batches = LogPipeline(self.paths, batch_size=AdaptiveBatchSize(initial=1, minimum=1)).batches()
+        next(batches)
+        batches.close()
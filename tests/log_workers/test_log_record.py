@@ -0,0 +1,42 @@
+import unittest
+from src.log_workers.log_record import LogRecord, SymbolTable
+from src.table import Table
+
+
+class TestLogRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.record = LogRecord(
+            "192.168.1.1", "-", "08/Nov/2024:10:52:20 +0000", "GET", "/index.html",
+            "HTTP/1.1", 200, 1024, "-", "Mozilla/5.0"
+        )
+
+    def test_mapping_access(self):
+        self.assertEqual(self.record["status"], 200, "Статус должен быть доступен по имени столбца")
+        self.assertEqual(self.record.get("request"), "/index.html", "get должен возвращать значение столбца")
+        self.assertIsNone(self.record.get("nonexistent_column"), "get должен возвращать None для неизвестного столбца")
+        self.assertEqual(list(self.record), list(LogRecord.FIELDS), "Ключи записи должны совпадать с FIELDS")
+
+    def test_record_has_no_dict(self):
+        self.assertFalse(hasattr(self.record, "__dict__"), "Запись не должна хранить собственный словарь")
+
+    def test_record_in_table(self):
+        table = Table([self.record])
+        self.assertIn("remote_addr", table.columns, "В таблице должен быть столбец 'remote_addr'")
+        self.assertEqual(table.get_column_length("status"), len("status"),
+                         "Длина числового столбца должна считаться по строковому представлению")
+
+
+class TestSymbolTable(unittest.TestCase):
+
+    def test_intern_returns_same_object(self):
+        symbols = SymbolTable()
+        first = symbols.intern("".join(["Mozilla", "/5.0"]))
+        second = symbols.intern("".join(["Mozilla", "/5.0"]))
+        self.assertIs(first, second, "Равные значения должны возвращаться одним объектом")
+
+    def test_intern_respects_max_size(self):
+        symbols = SymbolTable(max_size=1)
+        symbols.intern("a")
+        symbols.intern("b")
+        self.assertEqual(len(symbols), 1, "Таблица символов не должна расти больше max_size")
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from src.log_workers.log_parser import LogParser
+from src.log_workers.log_rejects import RejectCollector
+
+
+class TestRejectCollector(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_log = (
+            '127.0.0.1 - - [08/Nov/2024:10:52:20 +0000] '
+            '"GET /index.html HTTP/1.1" 200 1024 "-" "Mozilla/5.0"'
+        )
+
+    def test_classify(self):
+        cases = {
+            "": RejectCollector.EMPTY,
+            "2001:db8::1 - - [08/Nov/2024:10:52:20 +0000] \"GET / HTTP/1.1\" 200 1 \"-\" \"-\"":
+                RejectCollector.IPV6,
+            self.valid_log[:60]: RejectCollector.TRUNCATED,
+            "garbage": RejectCollector.MALFORMED,
+            "127.0.0.1 garbage": RejectCollector.MALFORMED,
+            '127.0.0.1 - - [08/Nov/2024:10:52:20 +0000] "\\x16\\x03\\x01 /" 400 0 "-" "-"':
+                RejectCollector.UNKNOWN_METHOD,
+            '127.0.0.1 - - [08/Nov/2024] "GET / HTTP/1.1" 200 1 "-" "-"': RejectCollector.MALFORMED,
+            '127.0.0.1 - - [08/Foo/2024:10:52:20 +0000] "GET / HTTP/1.1" 200 1 "-" "-"': RejectCollector.INVALID_TIME,
+        }
+        for line, reason in cases.items():
+            self.assertEqual(RejectCollector.classify(line), reason, f"Строка {line!r} должна быть '{reason}'")
+
+    def test_parse_lines_counts_rejects_per_source(self):
+        rejects = RejectCollector()
+        records = LogParser.parse_lines([self.valid_log, "garbage", ""], rejects, "access.log")
+        self.assertEqual(len(records), 1, "Должна разобраться только 1 строка")
+        self.assertEqual(rejects.total, 2, "Должно быть 2 отброшенные строки")
+        self.assertEqual(rejects.counts["access.log"][RejectCollector.EMPTY], 1,
+                         "Пустая строка должна учитываться в источнике 'access.log'")
+
+    def test_reject_file_samples(self):
+        descriptor, path = tempfile.mkstemp()
+        os.close(descriptor)
+        try:
+            rejects = RejectCollector(path, max_samples=1)
+            rejects.add("garbage", "a.log")
+            rejects.add("more garbage", "a.log")
+            rejects.close()
+            with open(path) as file:
+                self.assertEqual(file.read(), "a.log\tmalformed\tgarbage\n",
+                                 "В файл должен попасть только первый образец причины")
+        finally:
+            os.remove(path)
+
+    def test_regex_fails_fast_on_long_garbage(self):
+        line = self.valid_log[:-1] + " x" * 5000
+        self.assertIsNone(LogParser.parse_log(line), "Незакрытая кавычка не должна разбираться")
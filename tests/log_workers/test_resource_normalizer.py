@@ -0,0 +1,71 @@
+import unittest
+from src.log_workers.log_aggregator import LogAggregator
+from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.resource_normalizer import ResourceNormalizer
+from src.table import Table
+
+
+class TestResourceNormalizer(unittest.TestCase):
+
+    def setUp(self):
+        self.normalizer = ResourceNormalizer()
+
+    def test_strips_query_and_fragment(self):
+        self.assertEqual(self.normalizer.normalize("/downloads/product_1?x=1"), "/downloads/product_1")
+        self.assertEqual(self.normalizer.normalize("/downloads/product_1#top"), "/downloads/product_1")
+        self.assertEqual(self.normalizer.normalize("/search?q=a#b?c"), "/search")
+
+    def test_collapses_ids_and_uuids(self):
+        self.assertEqual(self.normalizer.normalize("/users/42/posts/7"), "/users/{id}/posts/{id}")
+        self.assertEqual(self.normalizer.normalize("/orders/123e4567-e89b-12d3-a456-426614174000"), "/orders/{uuid}")
+        self.assertEqual(self.normalizer.normalize("/orders/123e4567-e89b-12d3-a456"), "/orders/123e4567-e89b-12d3-a456",
+                         "Неполный UUID не должен заменяться")
+        self.assertEqual(self.normalizer.normalize("/"), "/", "Корень должен оставаться корнем")
+
+    def test_templates(self):
+        normalizer = ResourceNormalizer(["/downloads/*", "/users/{id}/*"])
+        self.assertEqual(normalizer.normalize("/downloads/product_1?x=2"), "/downloads/*")
+        self.assertEqual(normalizer.normalize("/users/42/settings"), "/users/{id}/*")
+        self.assertEqual(normalizer.normalize("/downloads/a/b"), "/downloads/a/b",
+                         "Шаблон должен совпадать по числу сегментов")
+
+    def test_route_depth(self):
+        normalizer = ResourceNormalizer(route_depth=1)
+        self.assertEqual(normalizer.normalize("/api/v1/users/42"), "/api")
+        with self.assertRaises(ValueError):
+            ResourceNormalizer(route_depth=0)
+
+    def test_cache_is_per_instance(self):
+        self.normalizer.normalize("/a/1")
+        self.normalizer.normalize("/a/1")
+        self.assertEqual(self.normalizer.normalize.cache_info().hits, 1, "Повторный путь должен браться из кэша")
+        self.assertEqual(ResourceNormalizer(route_depth=1).normalize("/a/1"), "/a",
+                         "Кэш одного нормализатора не должен влиять на другой")
+
+    def test_reduces_cardinality(self):
+        rows = [
+            {"request_type": "GET", "request": f"/downloads/product_{index % 3}?session={index}",
+             "remote_addr": "10.0.0.1", "time_local": "08/Nov/2024:10:52:20 +0000", "status": 200,
+             "body_bytes_sent": 1}
+            for index in range(1000)
+        ]
+        table = Table(rows)
+        raw = LogAnalyser.get_the_most_popular_resources(table, 1000)
+        normalized = LogAnalyser.get_the_most_popular_resources(table, 1000, normalizer=self.normalizer)
+        self.assertEqual(raw.size, 1000)
+        self.assertEqual(normalized.size, 3, "Нормализация должна схлопывать строки запроса")
+
+    def test_aggregator_normalizes_on_ingest(self):
+        rows = [
+            {"request_type": "GET", "request": f"/users/{index}?tab=posts", "remote_addr": "10.0.0.1",
+             "time_local": "08/Nov/2024:10:52:20 +0000", "status": 200, "body_bytes_sent": 1}
+            for index in range(100)
+        ]
+        aggregator = LogAggregator(self.normalizer)
+        aggregator.add_rows(rows)
+        self.assertEqual(aggregator.get_the_most_popular_resources(5), [("/users/{id}", 100)],
+                         "Агрегатор должен хранить только канонические пути")
+
+        table = LogAnalyser.get_the_most_popular_resources(aggregator.between_days(), 5, normalizer=self.normalizer)
+        self.assertEqual(table.rows, [{"resource": "/users/{id}", "value": "100"}],
+                         "Повторная нормализация не должна менять канонические пути")
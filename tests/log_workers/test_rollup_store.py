@@ -0,0 +1,125 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from src.log_workers.log_aggregator import LogAggregator
+from src.log_workers.log_analyser import LogAnalyser
+from src.log_workers.log_parser import LogParser
+from src.log_workers.log_rejects import RejectCollector
+from src.log_workers.resource_normalizer import ResourceNormalizer
+from src.log_workers.rollup_store import RollupStore
+from src.table import Table
+
+
+class TestRollupStore(unittest.TestCase):
+
+    LINES = [
+        '192.168.1.1 - - [08/Nov/2024:10:52:20 +0000] "GET /index.html HTTP/1.1" 200 1024 "-" "curl"\n',
+        '192.168.1.2 - - [08/Nov/2024:11:00:00 +0000] "POST /form HTTP/1.1" 404 2048 "-" "curl"\n',
+        '192.168.1.1 - - [08/Nov/2024:11:30:00 +0000] "GET /index.html HTTP/1.1" 200 512 "-" "curl"\n',
+        '10.0.0.1 - - [09/Nov/2024:15:30:00 +0000] "GET /about HTTP/1.1" 500 256 "-" "curl"\n',
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, "access.log.1")
+        with open(self.source, "w") as file:
+            file.writelines(self.LINES)
+        self.store = RollupStore(os.path.join(self.directory, "rollups.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_is_closed_source(self):
+        self.assertTrue(RollupStore.is_closed_source("/var/log/nginx/access.log.1"), "Ротированный файл закрыт")
+        self.assertTrue(RollupStore.is_closed_source("/var/log/nginx/access.log.2.gz"), "Сжатый файл закрыт")
+        self.assertFalse(RollupStore.is_closed_source("/var/log/nginx/access.log"), "Текущий файл открыт")
+        self.assertFalse(RollupStore.is_closed_source("https://example.com/access.log.1"), "URL не бывает закрытым")
+
+    def test_closed_source_is_read_once(self):
+        self.assertTrue(self.store.add_closed_source(self.source), "Новый файл должен быть прочитан")
+        self.assertFalse(self.store.add_closed_source(self.source), "Неизменный файл не должен читаться повторно")
+
+        with open(self.source, "a") as file:
+            file.write(self.LINES[0])
+        self.assertTrue(self.store.add_closed_source(self.source), "Изменившийся файл должен быть прочитан заново")
+        aggregator = LogAggregator()
+        self.store.load_days(aggregator)
+        self.assertEqual(aggregator.get_requests_quantity(), 5, "Свёртки изменившегося файла должны заменяться")
+
+    def test_rollups_match_raw_logs(self):
+        self.store.add_closed_source(self.source)
+        aggregator = LogAggregator()
+        self.assertEqual(self.store.load_days(aggregator, date(2024, 11, 8), date(2024, 11, 8)), 1)
+        logs = aggregator.between_days(date(2024, 11, 8), date(2024, 11, 8))
+        table = LogAnalyser.get_date_constrained_logs(
+            Table(LogParser.parse_lines(self.LINES)), date(2024, 11, 8), date(2024, 11, 8)
+        )
+
+        self.assertEqual(LogAnalyser.get_requests_quantity(logs), 3)
+        self.assertAlmostEqual(LogAnalyser.get_average_response_size(logs),
+                               LogAnalyser.get_average_response_size(table))
+        for method in (LogAnalyser.get_the_most_popular_statuses, LogAnalyser.get_the_most_active_users,
+                       LogAnalyser.get_the_most_popular_resources, LogAnalyser.get_the_most_high_loaded_days):
+            self.assertEqual(method(logs, 5).rows, method(table, 5).rows, f"{method.__name__} должен совпадать")
+
+    def test_rollups_combine_with_open_period(self):
+        compressed = os.path.join(self.directory, "access.log.2.gz")
+        with gzip.open(compressed, "wt") as file:
+            file.writelines(self.LINES[:2])
+        self.store.add_closed_source(compressed)
+        self.store.add_closed_source(self.source)
+
+        aggregator = LogAggregator()
+        self.store.load_days(aggregator, sources=[self.source])
+        self.assertEqual(aggregator.get_requests_quantity(), 4, "Должны загружаться только указанные файлы")
+        aggregator.add_rows(LogParser.parse_lines(self.LINES[3:]))
+        self.assertEqual(aggregator.get_the_most_popular_statuses(2, date(2024, 11, 9)), [(500, 2)],
+                         "Свёртки и сырые записи открытого периода должны складываться")
+
+    def test_max_keys_limits_users(self):
+        store = RollupStore(os.path.join(self.directory, "limited.db"), max_keys=1)
+        try:
+            store.add_closed_source(self.source)
+            aggregator = LogAggregator()
+            store.load_days(aggregator, date(2024, 11, 8), date(2024, 11, 8))
+            self.assertEqual(aggregator.get_the_most_active_users(5), [("192.168.1.1", 2)],
+                             "За день должен храниться только самый активный пользователь")
+        finally:
+            store.close()
+
+    def test_rollups_are_normalized_before_counting(self):
+        store = RollupStore(os.path.join(self.directory, "limited.db"), max_keys=1)
+        with open(self.source, "w") as file:
+            file.writelines(
+                f'192.168.1.1 - - [08/Nov/2024:10:00:00 +0000] "GET /downloads/product_1?x={number} HTTP/1.1" 200 1 '
+                f'"-" "curl"\n' for number in range(3)
+            )
+        try:
+            normalizer = ResourceNormalizer()
+            store.add_closed_source(self.source, normalizer=normalizer)
+            aggregator = LogAggregator(normalizer)
+            store.load_days(aggregator)
+            self.assertEqual(aggregator.get_the_most_popular_resources(5), [("/downloads/product_1", 3)],
+                             "Ресурсы должны нормализоваться до отбора max_keys самых частых")
+
+            self.assertFalse(store.is_stored(self.source), "Свёртки без нормализации хранятся отдельно")
+            store.add_closed_source(self.source)
+            aggregator = LogAggregator()
+            store.load_days(aggregator)
+            self.assertEqual(aggregator.get_requests_quantity(), 3,
+                             "Свёртки с разными нормализаторами не должны складываться")
+        finally:
+            store.close()
+
+    def test_rejects_are_stored(self):
+        with open(self.source, "a") as file:
+            file.write("garbage\n")
+        for read in (True, False):
+            rejects = RejectCollector()
+            self.assertEqual(self.store.add_closed_source(self.source, rejects), read)
+            self.assertEqual(rejects.counts, {self.source: {RejectCollector.MALFORMED: 1}},
+                             "Отброшенные строки должны учитываться и без повторного чтения файла")
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+from src.server.analysis_server import AnalysisServer
+
+
+class TestAnalysisServer(unittest.TestCase):
+
+    def setUp(self):
+        self.log_line = (
+            '192.168.1.1 - - [08/Nov/2024:10:52:20 +0000] '
+            '"GET /index.html HTTP/1.1" 200 1024 "-" "Mozilla/5.0"\n'
+        )
+        descriptor, self.path = tempfile.mkstemp()
+        with os.fdopen(descriptor, "w") as file:
+            file.write(self.log_line)
+
+        self.server = AnalysisServer([self.path], port=0, poll_interval=3600)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        os.remove(self.path)
+
+    def get(self, path):
+        host, port = self.server.address
+        with urlopen(f"http://{host}:{port}{path}") as response:
+            return json.loads(response.read())
+
+    def test_reports(self):
+        self.assertEqual(self.get("/overall")["requests"], 1, "Должен быть 1 запрос")
+        self.assertEqual(self.get("/statuses")["rows"], [{"status": "200", "responses": 1}])
+        self.assertEqual(self.get("/resources?lines=1")["rows"], [{"resource": "/index.html", "value": 1}])
+        self.assertEqual(self.get("/users?from=2024-11-09")["rows"], [],
+                         "После 09/Nov/2024 пользователей быть не должно")
+
+    def test_ingest_invalidates_cache(self):
+        self.assertEqual(self.get("/days")["rows"], [{"day": "2024-11-08", "requests": 1}])
+
+        with open(self.path, "a") as file:
+            file.write(self.log_line)
+            file.write(self.log_line.rstrip("\n"))
+        self.assertEqual(self.server.ingest(), 1, "Недописанная строка не должна читаться")
+
+        self.assertEqual(self.get("/days")["rows"], [{"day": "2024-11-08", "requests": 2}],
+                         "После дочитывания кэш должен сбрасываться")
+
+    def test_cache_is_bounded(self):
+        self.server.CACHE_SIZE = 2
+        for lines in range(1, 5):
+            self.get(f"/resources?lines={lines}")
+        self.assertEqual(len(self.server._cache), 2, "Кэш не должен расти сверх CACHE_SIZE")
+
+    def test_errors(self):
+        with self.assertRaises(HTTPError) as context:
+            self.get("/unknown")
+        self.assertEqual(context.exception.code, 404)
+
+        with self.assertRaises(HTTPError) as context:
+            self.get("/statuses?from=yesterday")
+        self.assertEqual(context.exception.code, 400)
+
+    def test_ingest_survives_bad_records(self):
+        with open(self.path, "a") as file:
+            file.write(self.log_line.replace("08/Nov/2024", "08/Foo/2024"))
+            file.write(self.log_line * 3)
+        self.assertEqual(self.server.ingest(), 3, "Корректные строки после некорректной должны добавляться")
+        self.assertEqual(self.get("/overall")["requests"], 4)
+        self.assertEqual(self.get("/rejects")["rows"][0]["reason"], "invalid_time",
+                         "Строка с некорректной датой должна учитываться как отброшенная")
+
+        self.assertEqual(
+            self.server.aggregator.add_rows([{"time_local": "08/Foo/2024:10:52:20 +0000"}], lambda row, error: None), 0,
+            "Запись, которую не удалось добавить, должна пропускаться"
+        )
+
+    def test_rejects_file(self):
+        descriptor, rejects_path = tempfile.mkstemp()
+        os.close(descriptor)
+        self.addCleanup(os.remove, rejects_path)
+        server = AnalysisServer([self.path], port=0, poll_interval=3600, rejects_file=rejects_path)
+        self.addCleanup(server.shutdown)
+
+        with open(self.path, "a") as file:
+            file.write("garbage\n")
+        server.ingest()
+        with open(self.path, "a") as file:
+            file.write("\n")
+        server.ingest()
+
+        self.assertEqual(server.query("rejects", {})["rows"], [
+            {"source": self.path, "reason": "malformed", "lines": 1},
+            {"source": self.path, "reason": "empty", "lines": 1},
+        ], "Отброшенные строки каждого дочитывания должны учитываться один раз")
+        server.shutdown()
+        with open(rejects_path) as file:
+            self.assertEqual(file.read(), f"{self.path}\tmalformed\tgarbage\n{self.path}\tempty\t\n",
+                             "В режиме сервера образцы должны дописываться в файл")
@@ -0,0 +1,33 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.server.source_follower import SourceFollower
+
+
+class TestSourceFollower(unittest.TestCase):
+
+    def setUp(self):
+        descriptor, self.path = tempfile.mkstemp()
+        os.close(descriptor)
+        self.addCleanup(os.remove, self.path)
+
+    def test_reads_in_bounded_batches(self):
+        with open(self.path, "w") as file:
+            file.write("first line\nsecond line\nthird")
+        follower = SourceFollower(self.path)
+
+        with patch.object(SourceFollower, "CHUNK_SIZE", 8):
+            batches = list(follower.read_new_batches())
+        self.assertEqual(batches, [["first line"], ["second line"]],
+                         "Строки должны выдаваться по мере чтения кусков, недописанная строка — не читаться")
+
+        with open(self.path, "a") as file:
+            file.write(" line\n")
+        self.assertEqual(list(follower.read_new_batches()), [["third line"]],
+                         "Недописанная строка должна дочитываться при следующем вызове")
+        self.assertEqual(list(follower.read_new_batches()), [], "Новых строк нет")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from src.log_workers.log_parser import LogParser
+
+
+class TestStartupImports(unittest.TestCase):
+
+    HEAVY_MODULES = [
+        "numpy",
+        "urllib.request",
+        "http.server",
+        "gzip",
+        "src.log_workers.columnar_logs",
+        "src.server.analysis_server",
+        "src.table_printers.adoc_table_printer",
+    ]
+
+    def loaded_modules(self, code):
+        script = f"import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+        return set(json.loads(output.splitlines()[-1]))
+
+    def test_import_main_is_lightweight(self):
+        modules = self.loaded_modules("import src.main")
+        for module in self.HEAVY_MODULES + ["src.log_workers.log_parser", "src.stats_printer.stats_printer"]:
+            self.assertNotIn(module, modules, f"Импорт точки входа не должен загружать {module}")
+
+    def test_report_loads_only_needed_modules(self):
+        descriptor, path = tempfile.mkstemp()
+        with os.fdopen(descriptor, "w") as file:
+            file.write('127.0.0.1 - - [08/Nov/2024:10:52:20 +0000] "GET / HTTP/1.1" 200 1 "-" "-"\n')
+        try:
+            modules = self.loaded_modules(f"import src.main\nsrc.main.main(['--sources', {path!r}])")
+        finally:
+            os.remove(path)
+
+        for module in self.HEAVY_MODULES:
+            self.assertNotIn(module, modules, f"Отчёт по локальному файлу не должен загружать {module}")
+
+
+class TestReadSource(unittest.TestCase):
+
+    def test_read_gzip_source(self):
+        descriptor, path = tempfile.mkstemp(suffix=".gz")
+        os.close(descriptor)
+        try:
+            with gzip.open(path, "wt") as file:
+                file.write("first\nsecond\n")
+            self.assertTrue(LogParser.is_compressed(path), "Файл .gz должен считаться сжатым")
+            self.assertEqual(LogParser.read_source(path), ["first\n", "second\n"],
+                             "Сжатый файл должен читаться построчно")
+        finally:
+            os.remove(path)
+
+
+class TestRollupReport(unittest.TestCase):
+
+    def test_report_from_rollups_only(self):
+        directory = tempfile.mkdtemp()
+        source = os.path.join(directory, "access.log.1")
+        with open(source, "w") as file:
+            file.write('127.0.0.1 - - [08/Nov/2024:10:52:20 +0000] "GET / HTTP/1.1" 200 1 "-" "-"\n')
+        command = [sys.executable, "-m", "src.main", "--sources", source,
+                   "--rollup-db", os.path.join(directory, "rollups.db")]
+        try:
+            for _ in range(2):
+                result = subprocess.run(command, capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertIn("Overall information", result.stderr,
+                              "Отчёт только по закрытым файлам должен строиться из свёрток")
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestBackendOption(unittest.TestCase):
+
+    def test_numpy_backend_without_numpy(self):
+        script = "import sys\nsys.modules['numpy'] = None\nimport src.main\nsrc.main.main(['--backend', 'numpy'])"
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 2, "Без NumPy параметр должен отклоняться как ошибка использования")
+        self.assertIn("--backend numpy requires NumPy to be installed", result.stderr)
+        self.assertNotIn("Traceback", result.stderr)
+
+    def test_numpy_backend_with_rollup_db(self):
+        script = "import src.main\nsrc.main.main(['--backend', 'numpy', '--rollup-db', 'rollups.db'])"
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 2, "Свёртки не считаются NumPy, поэтому сочетание должно отклоняться")
+        self.assertIn("--rollup-db cannot be combined with --backend numpy", result.stderr)
@@ -1,5 +1,5 @@
 import unittest
-from src.table import Table
+from src.table import Table, TableView
 
 
 class TestTableWithNginxLogs(unittest.TestCase):
@@ -82,3 +82,48 @@ class TestTableWithNginxLogs(unittest.TestCase):
                          "Если 'http_referer' отсутствует, оно должно быть '-'")
         self.assertEqual(self.table.get_cell(0, "nonexistent_column"), "None",
                          "Если столбец не существует, должно вернуться значение по умолчанию 'None'")
+
+    def test_filter_returns_lazy_view(self):
+        calls = []
+
+        def is_ok(row):
+            calls.append(row)
+            return row["status"] == "200"
+
+        view = self.table.filter(is_ok)
+        self.assertIsInstance(view, TableView, "filter должен возвращать представление таблицы")
+        self.assertEqual(calls, [], "Строки не должны просматриваться до обращения к представлению")
+        self.assertEqual(view.size, 1, "В представлении должна быть 1 строка со статусом 200")
+        self.assertEqual(view.columns, self.table.columns, "Столбцы представления совпадают со столбцами таблицы")
+
+    def test_chained_filters_compose(self):
+        view = self.table.filter(lambda row: row["http_user_agent"] == "Mozilla/5.0")
+        view = view.filter(lambda row: row["remote_user"] == "user1")
+        self.assertEqual([row["remote_addr"] for row in view.rows], ["192.168.1.2"],
+                         "Условия последовательных filter должны объединяться")
+        self.assertEqual(view.get_cell(0, "status"), "404", "Ячейка (0, 'status') представления должна быть '404'")
+
+    def test_view_add_row_raises(self):
+        view = self.table.filter(lambda row: True)
+        with self.assertRaises(ValueError):
+            view.add_row({"status": "500"})
+
+    def test_view_selects_rows_once(self):
+        calls = []
+
+        def is_ok(row):
+            calls.append(row)
+            return row["status"] == "200"
+
+        view = self.table.filter(is_ok)
+        self.assertEqual(view.size, 1)
+        rows = view.rows
+        self.assertIsInstance(rows, list, "rows представления должен быть списком, как у Table")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(view.rows, rows, "Повторное обращение должно давать те же строки")
+        self.assertEqual(view.get_cell(0, "status"), "200")
+        self.assertEqual(len(calls), self.table.size, "Условие должно проверяться для каждой строки один раз")
+
+        narrowed = view.filter(lambda row: row["remote_user"] == "-")
+        self.assertLessEqual(narrowed.size, view.size)
+        self.assertEqual(len(calls), self.table.size, "Сужение отобранного представления не должно перепроверять условия")